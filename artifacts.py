@@ -0,0 +1,115 @@
+import os
+import shutil
+import time
+import zipfile
+from collections import deque
+from contextlib import contextmanager
+
+import pytest
+from playwright.sync_api import Error as PlaywrightError
+
+import steps
+
+ARTIFACTS_ENABLED = os.environ.get('NEODOVE_ARTIFACTS', '1') == '1'
+ARTIFACT_DIR = os.path.join('reports', 'artifacts')
+ARTIFACT_CAP_MB = int(os.environ.get('NEODOVE_ARTIFACT_CAP_MB', 200))
+SCREENSHOT_BUFFER = int(os.environ.get('NEODOVE_SCREENSHOT_BUFFER', 5))
+
+# Step kinds followed by a ring buffer screenshot
+SCREENSHOT_STEP_KINDS = ('step', 'goto')
+
+# Reports of each phase of a test, stored by conftest.py so fixtures know whether the test failed
+phase_reports_key = pytest.StashKey()
+artifact_paths_key = pytest.StashKey()
+
+
+def _start_tracing(context):
+    # One trace per context, each test records its own chunk of it
+    if not getattr(context, '_failure_tracing', False):
+        context.tracing.start(screenshots=True, snapshots=True)
+        context._failure_tracing = True
+
+
+def _dir_size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def enforce_size_cap(root=ARTIFACT_DIR, cap_mb=ARTIFACT_CAP_MB):
+    if not os.path.isdir(root):
+        return
+    runs = sorted((os.path.join(root, name) for name in os.listdir(root)), key=os.path.getmtime)
+    sizes = {run: _dir_size(run) for run in runs}
+    total = sum(sizes.values())
+    while runs and total > cap_mb * 1024 * 1024:
+        oldest = runs.pop(0)
+        total -= sizes[oldest]
+        shutil.rmtree(oldest, ignore_errors=True)
+
+
+class FailureArtifacts:
+    def __init__(self, page, name):
+        self.page = page
+        self.name = name
+        self.screenshots = deque(maxlen=SCREENSHOT_BUFFER)
+
+    def start(self):
+        _start_tracing(self.page.context)
+        self.page.context.tracing.start_chunk(title=self.name)
+        if steps.current is not None and SCREENSHOT_BUFFER:
+            steps.current.listeners.append(self._after_step)
+        return self
+
+    def _after_step(self, step):
+        if step['depth'] == 0 and step['kind'] in SCREENSHOT_STEP_KINDS:
+            self.capture(step['label'])
+
+    def capture(self, label):
+        try:
+            self.screenshots.append((label, self.page.screenshot(type='jpeg', quality=60)))
+        except PlaywrightError:
+            pass
+
+    def discard(self):
+        self.page.context.tracing.stop_chunk()
+
+    def save(self):
+        run_dir = os.path.join(ARTIFACT_DIR, f"{self.name}-{time.strftime('%Y%m%d-%H%M%S')}")
+        os.makedirs(run_dir, exist_ok=True)
+        paths = {}
+        trace_path = os.path.join(run_dir, 'trace.zip')
+        self.page.context.tracing.stop_chunk(path=trace_path)
+        paths['trace'] = trace_path
+        self.capture('failure')
+        if self.screenshots:
+            screenshots_path = os.path.join(run_dir, 'screenshots.zip')
+            with zipfile.ZipFile(screenshots_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+                for index, (label, image) in enumerate(self.screenshots):
+                    safe_label = ''.join(c if c.isalnum() else '_' for c in label)[:60]
+                    archive.writestr(f"{index:02d}_{safe_label}.jpg", image)
+            paths['screenshots'] = screenshots_path
+        enforce_size_cap()
+        return paths
+
+
+def has_failed(node):
+    reports = node.stash.get(phase_reports_key, {})
+    return any(report.failed for report in reports.values())
+
+
+@contextmanager
+def failure_artifacts(page, node):
+    # Traces and screenshots stay in memory and only reach the disk when the test fails
+    if not ARTIFACTS_ENABLED or page.is_closed():
+        yield
+        return
+    artifacts = FailureArtifacts(page, node.name).start()
+    try:
+        yield
+    finally:
+        try:
+            if has_failed(node):
+                node.stash[artifact_paths_key] = artifacts.save()
+            else:
+                artifacts.discard()
+        except PlaywrightError as e:
+            print(f"Could not store failure artifacts for {node.name}: {e}")
@@ -0,0 +1,198 @@
+import argparse
+import asyncio
+import os
+import time
+
+from playwright.async_api import async_playwright, Error as PlaywrightError
+
+from constants import (login_credentials, LOGIN_URL, HOME_URL, LOGIN_MODE, SESSION_FILE, LAUNCH_PROFILE, LAUNCH_PROFILES,
+                       AUTH_LOGIN_URL, AUTH_CONFIRM_URL, token_init_script)
+from network_filter import install_request_filter_async
+from navigation import route_steps
+from pages import LOGIN_SELECTORS
+from quiescence import track_quiescence, wait_for_quiet_async
+from routes import NAV_ROUTES
+from session_cache import clear_session, session_is_fresh
+from waits import ANGULAR_STABLE_JS, ANIMATION_DONE_JS
+
+# Pages driven at the same time from one event loop
+CONCURRENCY = int(os.environ.get('NEODOVE_CONCURRENCY', 4))
+
+
+async def browser_setup(profile=LAUNCH_PROFILE):
+    playwright = await async_playwright().start()
+    browser = await playwright.chromium.launch(**LAUNCH_PROFILES[profile])
+    return browser, playwright
+
+
+async def close_browser(browser, playwright):
+    await browser.close()
+    await playwright.stop()
+
+
+async def new_context(browser, **kwargs):
+    context = await browser.new_context(**kwargs)
+    context.on('page', track_quiescence)
+    await install_request_filter_async(context)
+    return context
+
+
+async def login(page, credentials=None):
+    credentials = credentials or login_credentials
+    await page.goto(LOGIN_URL)
+    await page.fill(LOGIN_SELECTORS['username'], credentials['username'])
+    await page.fill(LOGIN_SELECTORS['password'], credentials['password'])
+    await page.click(LOGIN_SELECTORS['terms_checkbox'])
+    # click() waits for the button to become enabled once the terms are accepted
+    await page.click(LOGIN_SELECTORS['submit_button'])
+
+    # Handle the confirm login alert if it appears
+    await handle_confirm_login_alert(page)
+
+    await wait_for_quiet_async(page)
+    await page.goto(HOME_URL)
+    await wait_for_quiet_async(page)
+    return page
+
+
+async def handle_confirm_login_alert(page):
+    try:
+        await page.wait_for_selector(LOGIN_SELECTORS['confirm_dialog'], timeout=10000)
+        await page.click(LOGIN_SELECTORS['continue_button'])
+        await page.wait_for_function(ANGULAR_STABLE_JS, timeout=20000)
+    except Exception as e:
+        print(f"Confirmation popup did not appear or failed to click 'Continue': {e}")
+
+
+async def api_login(context, credentials=None):
+    # Same as constants.api_login(), cookies land in the context's jar
+    credentials = credentials or login_credentials
+    try:
+        response = await context.request.post(AUTH_LOGIN_URL, data={
+            'username': credentials['username'], 'password': credentials['password']})
+        body = await response.json() if response.ok else {}
+        if body.get('confirm'):
+            response = await context.request.post(AUTH_CONFIRM_URL, data={'token': body.get('token')})
+    except (PlaywrightError, ValueError) as e:
+        print(f"API login failed, falling back to the login form: {e}")
+        return None
+    if not response.ok:
+        print(f"API login failed with status {response.status}, falling back to the login form")
+        return None
+    token = body.get('token')
+    if token:
+        await context.add_init_script(token_init_script(token))
+    return token
+
+
+async def is_logged_in(context):
+    # Same check as session_cache.is_logged_in(): an expired session lands on the login page
+    page = await context.new_page()
+    try:
+        await page.goto(HOME_URL)
+        await wait_for_quiet_async(page)
+        return not page.url.startswith(LOGIN_URL)
+    finally:
+        await page.close()
+
+
+async def authenticated_context(browser, path=SESSION_FILE, login_mode=LOGIN_MODE):
+    # Logs in once and shares the storage state with every later context
+    if session_is_fresh(path):
+        context = await new_context(browser, storage_state=path)
+        if await is_logged_in(context):
+            return context
+        print("Cached session has expired, logging in again.")
+        await context.close()
+        clear_session(path)
+    context = await new_context(browser)
+    token = await api_login(context) if login_mode == 'api' else None
+    page = await context.new_page()
+    if token:
+        await page.goto(HOME_URL)
+    if not token or page.url.startswith(LOGIN_URL):
+        await login(page)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    await context.storage_state(path=path)
+    await page.close()
+    return context
+
+
+async def navigate_route(page, route, timeout=20000):
+    steps = route_steps(route)
+    for selector, next_selector in zip(steps, steps[1:] + [None]):
+        # Leave a menu alone when it is already expanded, clicking it again would collapse it
+        if next_selector and await page.is_visible(next_selector):
+            continue
+        element = await page.wait_for_selector(selector, state='visible', timeout=timeout)
+        await page.wait_for_function(ANIMATION_DONE_JS, arg=element, timeout=timeout)
+        await page.click(selector)
+    # The router may update the URL after the click's requests have settled, see navigation.navigate_to
+    try:
+        await page.wait_for_url(route['url'], timeout=timeout)
+    except PlaywrightError as e:
+        print(f"Navigation to {route['name']} did not reach {route['url']}: {e}")
+    await wait_for_quiet_async(page)
+    return page.url
+
+
+async def run_concurrently(jobs, concurrency=CONCURRENCY):
+    # jobs are zero-argument coroutine functions, at most `concurrency` of them run at once
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(job):
+        async with semaphore:
+            return await job()
+
+    return await asyncio.gather(*(limited(job) for job in jobs), return_exceptions=True)
+
+
+async def check_route(browser, route, storage_state):
+    context = await new_context(browser, storage_state=storage_state)
+    started = time.monotonic()
+    try:
+        page = await context.new_page()
+        await page.goto(HOME_URL)
+        current_url = await navigate_route(page, route)
+        return {'route': route['name'], 'passed': current_url == route['url'], 'url': current_url,
+                'duration_ms': round((time.monotonic() - started) * 1000, 1)}
+    finally:
+        await context.close()
+
+
+async def check_routes(routes=NAV_ROUTES, concurrency=CONCURRENCY):
+    browser, playwright = await browser_setup()
+    try:
+        context = await authenticated_context(browser)
+        storage_state = await context.storage_state()
+        await context.close()
+        jobs = [lambda route=route: check_route(browser, route, storage_state) for route in routes]
+        return await run_concurrently(jobs, concurrency)
+    finally:
+        await close_browser(browser, playwright)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check every sidebar route concurrently from one process")
+    parser.add_argument('-c', '--concurrency', type=int, default=CONCURRENCY)
+    args = parser.parse_args(argv)
+
+    started = time.monotonic()
+    results = asyncio.run(check_routes(concurrency=args.concurrency))
+    failed = 0
+    for route, result in zip(NAV_ROUTES, results):
+        if isinstance(result, Exception):
+            failed += 1
+            print(f"ERROR {route['name']}: {result}")
+        elif not result['passed']:
+            failed += 1
+            print(f"FAIL  {route['name']}: expected '{route['url']}' but got '{result['url']}'")
+        else:
+            print(f"PASS  {route['name']} in {result['duration_ms']:.0f}ms")
+    print(f"{len(results) - failed}/{len(results)} routes passed in {time.monotonic() - started:.1f}s "
+          f"with concurrency {args.concurrency}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
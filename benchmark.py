@@ -0,0 +1,184 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+BENCHMARK_DIR = 'benchmarks'
+HISTORY_FILE = os.path.join(BENCHMARK_DIR, 'history.jsonl')
+BASELINE_FILE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+# Flow name -> (pytest -k expression, pattern matching the test names of the flow)
+FLOWS = {
+    'login': ('test_login and not test_login_page_elements', r'test_login(\[|$)'),
+    'invalid-login': ('test_invalid_login', r'test_invalid_login_'),
+    'navigation': ('test_navigation_route', r'test_navigation_route\['),
+}
+
+
+def percentile(values, pct):
+    # Nearest-rank percentile, good enough for a handful of runs
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(values):
+    return {
+        'runs': len(values),
+        'p50_ms': round(percentile(values, 50), 1),
+        'p95_ms': round(percentile(values, 95), 1),
+        'max_ms': round(max(values), 1),
+    }
+
+
+def flow_of(nodeid):
+    test_name = nodeid.split('::')[-1]
+    for flow, (_, pattern) in FLOWS.items():
+        if re.match(pattern, test_name):
+            return flow
+    return None
+
+
+def run_iteration(index, flows, pytest_args):
+    steps_file = os.path.join(BENCHMARK_DIR, f"steps_{index}.json")
+    expression = ' or '.join(f"({FLOWS[flow][0]})" for flow in flows)
+    env = dict(os.environ, NEODOVE_STEPS_FILE=steps_file)
+    command = [sys.executable, '-m', 'pytest', '-q', '-k', expression, '-p', 'no:cacheprovider'] + pytest_args
+    subprocess.run(command, env=env)
+    if not os.path.exists(steps_file):
+        print(f"Iteration {index} produced no results")
+        return {}
+    with open(steps_file) as f:
+        results = json.load(f)
+    os.remove(steps_file)
+    return results
+
+
+def collect(iterations, flows, pytest_args):
+    flow_times = {flow: [] for flow in flows}
+    step_times = {flow: {} for flow in flows}
+    failures = {flow: 0 for flow in flows}
+    for index in range(iterations):
+        print(f"Benchmark iteration {index + 1}/{iterations}")
+        totals = {}
+        failed_flows = set()
+        for nodeid, result in run_iteration(index, flows, pytest_args).items():
+            flow = flow_of(nodeid)
+            if flow not in flow_times:
+                continue
+            # A test that failed early would look like a speedup, its timings are left out
+            if result['outcome'] != 'passed':
+                failures[flow] += 1
+                failed_flows.add(flow)
+                continue
+            totals[flow] = totals.get(flow, 0) + result['duration_ms']
+            for step in result['steps']:
+                step_times[flow].setdefault(step['label'], []).append(step['duration_ms'])
+        for flow, total in totals.items():
+            if flow not in failed_flows:
+                flow_times[flow].append(total)
+
+    summary = {}
+    for flow in flows:
+        if not flow_times[flow] and not failures[flow]:
+            continue
+        summary[flow] = summarize(flow_times[flow]) if flow_times[flow] else {'runs': 0}
+        summary[flow]['failures'] = failures[flow]
+        summary[flow]['steps'] = {label: summarize(values) for label, values in step_times[flow].items()}
+    return summary
+
+
+def load_baseline(path=BASELINE_FILE):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def find_regressions(summary, baseline, threshold):
+    regressions = []
+    for flow, stats in summary.items():
+        base = baseline.get('flows', {}).get(flow)
+        if not base:
+            continue
+        if stats['failures'] > base.get('failures', 0):
+            regressions.append(f"{flow} had {stats['failures']} failed tests, baseline {base.get('failures', 0)}")
+        for key in ('p50_ms', 'p95_ms'):
+            # Flows with no passing runs have no timings on either side
+            if key not in stats or key not in base:
+                continue
+            limit = base[key] * (1 + threshold)
+            if stats[key] > limit:
+                regressions.append(f"{flow} {key} {stats[key]:.0f}ms exceeds baseline {base[key]:.0f}ms "
+                                   f"by more than {threshold:.0%}")
+    return regressions
+
+
+def print_summary(summary):
+    for flow, stats in summary.items():
+        if not stats['runs']:
+            print(f"{flow:>14}: no passing runs ({stats['failures']} failed tests)")
+            continue
+        print(f"{flow:>14}: p50 {stats['p50_ms']:.0f}ms  p95 {stats['p95_ms']:.0f}ms  max {stats['max_ms']:.0f}ms  "
+              f"({stats['runs']} runs, {stats['failures']} failed tests)")
+        slowest = sorted(stats['steps'].items(), key=lambda item: item[1]['p95_ms'], reverse=True)[:5]
+        for label, step in slowest:
+            print(f"{'':>16}{step['p95_ms']:>8.0f}ms p95  {label}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the login, invalid-login and navigation flows")
+    parser.add_argument('-k', '--iterations', type=int, default=5)
+    parser.add_argument('--flows', nargs='+', choices=sorted(FLOWS), default=list(FLOWS))
+    parser.add_argument('--threshold', type=float, default=float(os.environ.get('NEODOVE_BENCH_THRESHOLD', 0.2)),
+                        help="Allowed slowdown against the baseline, 0.2 means 20%%")
+    parser.add_argument('--update-baseline', action='store_true', help="Store this run as the new baseline")
+    parser.add_argument('--throttle', default=os.environ.get('NEODOVE_THROTTLE', 'none'),
+                        help="Throttling profile for every test, see THROTTLE_PROFILES in throttling.py")
+    parser.add_argument('--stand-in', action='store_true', help="Benchmark against the local stand-in server")
+    parser.add_argument('--stand-in-config', help="Latency config for the stand-in, see stand_in_server.py")
+    args, pytest_args = parser.parse_known_args(argv)
+
+    os.makedirs(BENCHMARK_DIR, exist_ok=True)
+    # Passed on to the pytest subprocesses; every profile has a baseline of its own
+    os.environ['NEODOVE_THROTTLE'] = args.throttle
+    baseline_file = BASELINE_FILE if args.throttle == 'none' else os.path.join(BENCHMARK_DIR, f"baseline_{args.throttle}.json")
+    if args.stand_in:
+        from stand_in_server import LatencyProfile, start_stand_in
+        latency = LatencyProfile.from_file(args.stand_in_config) if args.stand_in_config else None
+        stand_in = start_stand_in(latency=latency)
+        os.environ['NEODOVE_BASE_URL'] = stand_in.base_url
+        # The stand-in implements the auth endpoints, see LOGIN_MODE in constants.py
+        os.environ.setdefault('NEODOVE_LOGIN_MODE', 'api')
+
+    summary = collect(args.iterations, args.flows, pytest_args)
+    print_summary(summary)
+
+    entry = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'iterations': args.iterations,
+        'throttle': args.throttle,
+        'target': os.environ.get('NEODOVE_BASE_URL', 'https://connect.neodove.com'),
+        'flows': summary,
+    }
+    with open(HISTORY_FILE, 'a') as f:
+        f.write(json.dumps(entry) + '\n')
+
+    baseline = load_baseline(baseline_file)
+    if args.update_baseline or baseline is None:
+        with open(baseline_file, 'w') as f:
+            json.dump(entry, f, indent=2)
+        print(f"Stored baseline in {baseline_file}")
+        return 0
+
+    regressions = find_regressions(summary, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
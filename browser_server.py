@@ -0,0 +1,264 @@
+import argparse
+import json
+import os
+import shutil
+import signal
+import subprocess
+import time
+import urllib.request
+from contextlib import contextmanager
+
+from constants import BROWSER_SERVER, LAUNCH_PROFILE, LAUNCH_PROFILES
+from process_stats import psutil, browser_rss_mb
+
+SERVER_DIR = '.browser_server'
+STATE_FILE = os.path.join(SERVER_DIR, 'state.json')
+LOCK_FILE = os.path.join(SERVER_DIR, 'lock')
+# One file per process connected to the server, named after its pid
+CLIENTS_DIR = os.path.join(SERVER_DIR, 'clients')
+LOCK_TIMEOUT = 60
+SERVER_PORT = int(os.environ.get('NEODOVE_BROWSER_SERVER_PORT', 9333))
+# Restarted once it is older than this, or its process tree is bigger than this
+SERVER_MAX_AGE = int(os.environ.get('NEODOVE_BROWSER_SERVER_MAX_AGE', 4 * 3600))
+SERVER_MAX_RSS_MB = int(os.environ.get('NEODOVE_BROWSER_SERVER_MAX_RSS_MB', 2000))
+
+
+@contextmanager
+def server_lock(timeout=LOCK_TIMEOUT):
+    # Parallel workers check and restart the server one at a time. A lock older than
+    # the timeout was left behind by a process that died holding it.
+    os.makedirs(SERVER_DIR, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            os.close(os.open(LOCK_FILE, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(LOCK_FILE) > timeout:
+                    os.remove(LOCK_FILE)
+                    continue
+            except OSError:
+                continue
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Timed out waiting for {LOCK_FILE}")
+            time.sleep(0.1)
+    try:
+        yield
+    finally:
+        os.remove(LOCK_FILE)
+
+
+def load_state(path=STATE_FILE):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _version(port, timeout=2):
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=timeout) as response:
+        return json.load(response)
+
+
+def _alive(pid):
+    if psutil is not None:
+        return psutil.pid_exists(pid)
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+def _process_identity(pid):
+    # Start time and executable, so a reused pid is not mistaken for the browser we started.
+    # Without psutil they are read from /proc where there is one.
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            return {'create_time': process.create_time(), 'executable': process.exe()}
+        except psutil.Error:
+            return None
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            start_ticks = f.read().rsplit(')', 1)[1].split()[19]
+        return {'start_ticks': start_ticks, 'executable': os.readlink(f'/proc/{pid}/exe')}
+    except (OSError, IndexError):
+        return None
+
+
+def is_ours(state):
+    # A pid that cannot be identified is never treated as ours
+    if state is None or not state.get('identity') or not _alive(state['pid']):
+        return False
+    return _process_identity(state['pid']) == state['identity']
+
+
+def register_client():
+    os.makedirs(CLIENTS_DIR, exist_ok=True)
+    open(os.path.join(CLIENTS_DIR, str(os.getpid())), 'w').close()
+
+
+def unregister_client():
+    try:
+        os.remove(os.path.join(CLIENTS_DIR, str(os.getpid())))
+    except FileNotFoundError:
+        pass
+
+
+def attached_clients():
+    # Pids of other live processes connected to the server, entries of dead ones are dropped
+    if not os.path.isdir(CLIENTS_DIR):
+        return []
+    clients = []
+    for name in os.listdir(CLIENTS_DIR):
+        pid = int(name)
+        if pid == os.getpid():
+            continue
+        if _alive(pid):
+            clients.append(pid)
+        else:
+            os.remove(os.path.join(CLIENTS_DIR, name))
+    return clients
+
+
+def is_running(state):
+    if not is_ours(state):
+        return False
+    try:
+        _version(state['port'])
+    except OSError:
+        return False
+    return True
+
+
+def restart_reason(state):
+    age = time.time() - state['started']
+    if age > SERVER_MAX_AGE:
+        return f"stale, running for {age / 3600:.1f}h"
+    rss = browser_rss_mb(state['pid'])
+    if rss is not None and rss > SERVER_MAX_RSS_MB:
+        return f"bloated, using {rss:.0f}MB"
+    return None
+
+
+def _chromium_args(profile, port):
+    options = LAUNCH_PROFILES[profile]
+    args = [f'--remote-debugging-port={port}', f'--user-data-dir={os.path.abspath(os.path.join(SERVER_DIR, "profile"))}',
+            '--no-first-run', '--no-default-browser-check']
+    if options.get('headless', True):
+        args.append('--headless=new')
+    return args + options.get('args', [])
+
+
+def start_server(profile=LAUNCH_PROFILE, port=SERVER_PORT, timeout=20):
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as playwright:
+        executable = playwright.chromium.executable_path
+    # Its own session, so the browser outlives the pytest run that started it
+    process = subprocess.Popen([executable] + _chromium_args(profile, port), start_new_session=True,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            endpoint = _version(port)['webSocketDebuggerUrl']
+            break
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError(f"Browser server did not come up on port {port}")
+            time.sleep(0.2)
+    state = {'pid': process.pid, 'port': port, 'endpoint': endpoint, 'profile': profile, 'started': time.time(),
+             'identity': _process_identity(process.pid)}
+    with open(STATE_FILE, 'w') as f:
+        json.dump(state, f, indent=2)
+    print(f"Browser server {profile} running on {endpoint} (pid {process.pid})")
+    return state
+
+
+def stop_server(state=None):
+    state = state or load_state()
+    # After a reboot or once the pid is reused the state points at some other process,
+    # which is left alone and only the state dropped
+    if is_ours(state):
+        # The browser runs in its own process group, see start_server()
+        os.killpg(state['pid'], signal.SIGTERM)
+        for _ in range(50):
+            if not _alive(state['pid']):
+                break
+            time.sleep(0.1)
+        else:
+            os.killpg(state['pid'], signal.SIGKILL)
+    if os.path.exists(STATE_FILE):
+        os.remove(STATE_FILE)
+    # A fresh profile directory drops the cache and storage the old browser piled up
+    shutil.rmtree(os.path.join(SERVER_DIR, 'profile'), ignore_errors=True)
+    shutil.rmtree(CLIENTS_DIR, ignore_errors=True)
+
+
+def server_endpoint(profile=LAUNCH_PROFILE):
+    # State of the server to connect to, or None to launch a browser of our own. The caller is
+    # registered as a client and calls unregister_client() once it disconnects. A server that has
+    # gone stale or bloated is restarted here when nobody else is connected; one that is gone is left gone.
+    if BROWSER_SERVER == 'off' or os.name != 'posix' or not os.path.exists(STATE_FILE):
+        return None
+    with server_lock():
+        state = load_state()
+        if state is None or state['profile'] != profile:
+            return None
+        if not is_running(state):
+            print("Browser server is not answering, launching a browser instead")
+            stop_server(state)
+            return None
+        reason = restart_reason(state)
+        if reason is not None:
+            clients = attached_clients()
+            if clients:
+                print(f"Browser server is {reason}, but {len(clients)} other runs are connected, reusing it")
+            else:
+                print(f"Browser server is {reason}, restarting it")
+                stop_server(state)
+                try:
+                    state = start_server(profile, state['port'])
+                except RuntimeError as e:
+                    print(f"{e}, launching a browser instead")
+                    return None
+        register_client()
+        return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Long-lived Chromium that test runs connect to over CDP")
+    parser.add_argument('command', choices=['start', 'stop', 'restart', 'status'])
+    parser.add_argument('--profile', default=LAUNCH_PROFILE, choices=sorted(LAUNCH_PROFILES))
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    args = parser.parse_args(argv)
+    if os.name != 'posix':
+        raise SystemExit("The browser server needs POSIX process groups, test runs launch their own browser here")
+
+    with server_lock():
+        state = load_state()
+        running = is_running(state)
+        if args.command == 'status':
+            if not running:
+                print("Browser server is not running")
+                return 1
+            print(f"Browser server {state['profile']} on {state['endpoint']}, pid {state['pid']}, "
+                  f"up {(time.time() - state['started']) / 60:.0f}min, {browser_rss_mb(state['pid']) or '?'}MB, "
+                  f"{len(attached_clients())} runs connected, {restart_reason(state) or 'healthy'}")
+            return 0
+        if args.command == 'start' and running:
+            print(f"Browser server already running on {state['endpoint']}")
+            return 0
+        if state:
+            stop_server(state)
+            print("Browser server stopped")
+        if args.command in ('start', 'restart'):
+            start_server(args.profile, args.port)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,5 +1,267 @@
+import os
+
 import pytest
 
+import steps
+from artifacts import artifact_paths_key, phase_reports_key
+from har import HAR_MODE, HAR_STRICT, check_har, har_name_for
+from navigation import navigation_stats
+from network_filter import filter_stats, save_request_sizes
+from quiescence import quiet_stats, slowest_requests
+from resource_monitor import ResourceWatch
+from results_report import Aggregator
+from results_sink import ResultSink, run_id
+from run_history import load_history, save_history, record_duration, record_result, balance_shards
+from scheduling import is_core, order_items
+from selection import input_hash, needs_run
+from steps import StepRecorder, waterfall_html, write_steps
+from throttling import THROTTLE_PROFILES, profile_for
+from waits import sleep_stats, sleep_savings
+
+try:
+    from pytest_html import extras as html_extras
+except ImportError:
+    html_extras = None
+
+REPORT_PATH = os.path.join('reports', 'report.html')
+
+_durations = {}
+_outcomes = {}
+_input_hashes = {}
+_step_results = {}
+_core_failures = []
+_leaks = {}
+_session = None
+_sink = None
+step_recorder_key = pytest.StashKey()
+input_hash_key = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    parser.addoption('--changed-only', action='store_true', default=False,
+                     help="Only run tests whose selectors, expected URLs or helper code changed, "
+                          "or that did not pass last time")
+    parser.addoption('--file-order', action='store_true', default=False,
+                     help="Run tests in file order instead of failed-first, fastest-first")
+    parser.addoption('--fail-fast-after', type=int, default=0, metavar='N',
+                     help="Stop the run once N core tests (login, dashboard) have failed")
+
+
+def pytest_configure(config):
+    # Before xdist starts the workers, so they stream into the same results file
+    run_id()
+    config.addinivalue_line('markers', f"throttle(profile): run the test under a throttling profile, "
+                                       f"one of {', '.join(THROTTLE_PROFILES)}")
+
+
+def pytest_sessionstart(session):
+    global _session, _sink
+    _session = session
+    _sink = ResultSink(worker=os.environ.get('PYTEST_XDIST_WORKER', 'main'))
+    _sink.write('run_start', sync=True, run_id=run_id())
+
+
 @pytest.hookimpl(tryfirst=True)
 def pytest_html_report_title(report):
     report.title = "Neodove Web Automation Report"
+
+
+def _is_xdist_worker(config):
+    return hasattr(config, 'workerinput')
+
+
+def _parallel_workers(config):
+    if not config.pluginmanager.hasplugin('xdist'):
+        return 0
+    if config.getoption('dist', 'no') != 'loadgroup':
+        return 0
+    return config.getoption('numprocesses') or 0
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    history = load_history()
+    for item in items:
+        item.stash[input_hash_key] = input_hash(item)
+
+    if config.getoption('changed_only'):
+        selected = [item for item in items if needs_run(history.get(item.nodeid), item.stash[input_hash_key])]
+        deselected = [item for item in items if not needs_run(history.get(item.nodeid), item.stash[input_hash_key])]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+
+    if not config.getoption('file_order'):
+        order_items(items, history)
+
+    workers = _parallel_workers(config)
+    if workers < 2:
+        return
+    # Pin tests to workers so every worker gets about the same total runtime.
+    # Runs on each xdist worker before xdist turns the groups into node id suffixes.
+    shards, _ = balance_shards([item.nodeid for item in items], history, workers)
+    for item in items:
+        item.add_marker(pytest.mark.xdist_group(name=f"shard{shards[item.nodeid]}"))
+
+
+@pytest.fixture(autouse=True)
+def step_timing(request):
+    recorder = StepRecorder()
+    nodeid = request.node.nodeid.split('@')[0]
+    recorder.listeners.append(lambda record: _sink.step(nodeid, record))
+    request.node.stash[step_recorder_key] = recorder
+    steps.current = recorder
+    yield recorder
+    steps.current = None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    item.stash.setdefault(phase_reports_key, {})[report.when] = report
+    report.user_properties.append(('input_hash', item.stash.get(input_hash_key, None)))
+    if report.when == 'teardown' and html_extras is not None:
+        # Written by the page fixtures' teardown, linked rather than inlined in the report
+        for name, path in item.stash.get(artifact_paths_key, {}).items():
+            link = os.path.relpath(path, os.path.dirname(REPORT_PATH))
+            report.extras = getattr(report, 'extras', []) + [html_extras.url(link, name=name)]
+    if report.when == 'teardown':
+        properties = dict(item.user_properties, throttle=profile_for(item))
+        _sink.test(item.nodeid.split('@')[0], item.stash[phase_reports_key], properties)
+    leak = _leak_of(report)
+    if report.when == 'teardown' and leak and html_extras is not None:
+        report.extras = getattr(report, 'extras', []) + [html_extras.html(
+            f'<p style="color:#c0392b">Leaked {leak[0]} contexts and {leak[1]} pages</p>')]
+    recorder = item.stash.get(step_recorder_key, None)
+    if report.when != 'call' or recorder is None:
+        return
+    # user_properties travel back from xdist workers, the JSON file is written by the main process
+    report.user_properties.append(('steps', list(recorder.steps)))
+    report.user_properties.append(('throttle', profile_for(item)))
+    if html_extras is not None and recorder.steps:
+        report.extras = getattr(report, 'extras', []) + [html_extras.html(waterfall_html(recorder.steps))]
+
+
+@pytest.fixture(autouse=True)
+def request_filter_stats(request):
+    before = dict(filter_stats)
+    yield
+    blocked = filter_stats['blocked'] - before['blocked']
+    blocked_bytes = filter_stats['blocked_bytes'] - before['blocked_bytes']
+    request.node.user_properties.append(('blocked_requests', blocked))
+    request.node.user_properties.append(('blocked_bytes', blocked_bytes))
+
+
+@pytest.fixture(autouse=True)
+def browser_resources(request):
+    if 'browser_handle' not in request.fixturenames:
+        yield
+        return
+    owned = list
+    if 'context_pool' in request.fixturenames:
+        owned = request.getfixturevalue('context_pool').contexts
+    resources = ResourceWatch(request.getfixturevalue('browser_handle'), owned).start()
+    yield
+    for name, value in resources.finish(request.node.name).items():
+        request.node.user_properties.append((name, value))
+
+
+@pytest.fixture(autouse=True)
+def har_staleness(request):
+    yield
+    if HAR_MODE != 'replay':
+        return
+    # Runs after the page fixtures have closed their contexts
+    stale = check_har(har_name_for(request.node))
+    if stale is None:
+        return
+    request.node.user_properties.append(('har_missing', len(stale['missing'])))
+    request.node.user_properties.append(('har_unused', len(stale['unused'])))
+    if stale['missing'] or stale['unused']:
+        message = (f"HAR archive for {request.node.name} is stale: {len(stale['missing'])} requests not recorded, "
+                   f"{len(stale['unused'])} recorded requests unused. Missing: {stale['missing'][:5]}")
+        if HAR_STRICT:
+            pytest.fail(message)
+        print(message)
+
+
+def _leak_of(report):
+    properties = dict(report.user_properties)
+    leak = (properties.get('leaked_contexts', 0), properties.get('leaked_pages', 0))
+    return leak if any(leak) else None
+
+
+def _stop_if_core_broken(nodeid):
+    limit = _session.config.getoption('fail_fast_after') if _session else 0
+    if not limit or not is_core(nodeid) or nodeid in _core_failures:
+        return
+    _core_failures.append(nodeid)
+    if len(_core_failures) >= limit:
+        _session.shouldstop = f"{len(_core_failures)} core tests failed: {', '.join(_core_failures)}"
+
+
+def pytest_runtest_logreport(report):
+    # Strip the '@shardN' suffix added by xdist's loadgroup mode
+    nodeid = report.nodeid.split('@')[0]
+    if report.when == 'call' or (report.when == 'setup' and report.outcome != 'passed'):
+        _durations[nodeid] = _durations.get(nodeid, 0) + report.duration
+    _input_hashes[nodeid] = dict(report.user_properties).get('input_hash')
+    if report.failed:
+        _outcomes[nodeid] = 'failed'
+        _stop_if_core_broken(nodeid)
+    elif report.when == 'call' or report.skipped:
+        _outcomes.setdefault(nodeid, report.outcome)
+    if report.when == 'teardown' and _leak_of(report):
+        _leaks[nodeid] = _leak_of(report)
+    if report.when == 'call':
+        _step_results[nodeid] = {
+            'outcome': report.outcome,
+            'duration_ms': round(report.duration * 1000, 1),
+            'steps': dict(report.user_properties).get('steps', []),
+            'throttle': dict(report.user_properties).get('throttle', 'none'),
+        }
+
+
+def pytest_sessionfinish(session, exitstatus):
+    save_request_sizes()
+    if _is_xdist_worker(session.config):
+        _sink.close()
+        return
+    _sink.write('run_end', sync=True, exitstatus=int(exitstatus))
+    _sink.close()
+    aggregator = Aggregator(_sink.path)
+    aggregator.feed()
+    aggregator.write_views()
+    if not _durations:
+        return
+    write_steps(_step_results)
+    history = load_history()
+    for nodeid, duration in _durations.items():
+        record_duration(history, nodeid, duration)
+    for nodeid, outcome in _outcomes.items():
+        record_result(history, nodeid, outcome, _input_hashes.get(nodeid))
+    save_history(history)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if sleep_stats['calls']:
+        terminalreporter.write_line(
+            f"Condition waits: {sleep_stats['calls']} calls replaced {sleep_stats['replaced_ms'] / 1000:.1f}s "
+            f"of fixed sleeps in {sleep_stats['waited_ms'] / 1000:.1f}s, saved {sleep_savings() / 1000:.1f}s")
+    if navigation_stats['reloads_avoided'] or navigation_stats['hard_reloads']:
+        terminalreporter.write_line(
+            f"In-app navigation: {navigation_stats['reloads_avoided']} page reloads avoided, "
+            f"{navigation_stats['hard_reloads']} hard reloads")
+    if quiet_stats['waits']:
+        terminalreporter.write_line(
+            f"Network quiescence: {quiet_stats['waits']} waits took {quiet_stats['waited_ms'] / 1000:.1f}s, "
+            f"{quiet_stats['timeouts']} timed out")
+        for url, delayed_ms in slowest_requests():
+            terminalreporter.write_line(f"  {delayed_ms / 1000:.1f}s waiting on {url}")
+    if filter_stats['blocked']:
+        terminalreporter.write_line(
+            f"Request filter: blocked {filter_stats['blocked']} requests, saved ~{filter_stats['blocked_bytes'] / 1024:.0f} KiB "
+            f"({filter_stats['unknown_size']} of unknown size, run with NEODOVE_FILTER_PROFILE=off to learn them)")
+    for nodeid, (contexts, pages) in _leaks.items():
+        terminalreporter.write_line(f"Leak: {nodeid} left {contexts} contexts and {pages} pages open", yellow=True)
@@ -1,49 +1,204 @@
 
+import json
+import os
+import time
+
 login_credentials = {
     'username': '',
     'password': ''
 }
 
-LOGIN_URL = "https://connect.neodove.com/login"
-HOME_URL = "https://connect.neodove.com/home"
+# Point at a local stand-in (see stand_in_server.py) with NEODOVE_BASE_URL
+BASE_URL = os.environ.get('NEODOVE_BASE_URL', "https://connect.neodove.com").rstrip('/')
+LOGIN_URL = f"{BASE_URL}/login"
+HOME_URL = f"{BASE_URL}/home"
+
+# Cached storage state (cookies + localStorage) of a logged in session,
+# one per xdist worker so parallel runs never share a file
+WORKER_ID = os.environ.get('PYTEST_XDIST_WORKER', 'main')
+SESSION_FILE = os.path.join('.auth', f'storage_state_{WORKER_ID}.json')
+SESSION_TTL = int(os.environ.get('NEODOVE_SESSION_TTL', 3600))
 
-from playwright.sync_api import sync_playwright
+# 'api' logs in by calling the auth endpoints directly, 'ui' drives the login form.
+# The default auth paths are the stand-in's, the production ones are still to be confirmed,
+# so 'api' is only the default once NEODOVE_AUTH_LOGIN_PATH is set.
+# Tests of the login page itself always use the form.
+LOGIN_MODE = os.environ.get('NEODOVE_LOGIN_MODE', 'api' if 'NEODOVE_AUTH_LOGIN_PATH' in os.environ else 'ui')
+AUTH_LOGIN_URL = f"{BASE_URL}{os.environ.get('NEODOVE_AUTH_LOGIN_PATH', '/api/login')}"
+AUTH_CONFIRM_URL = f"{BASE_URL}{os.environ.get('NEODOVE_AUTH_CONFIRM_PATH', '/api/login/confirm')}"
+TOKEN_STORAGE_KEY = os.environ.get('NEODOVE_TOKEN_STORAGE_KEY', 'token')
+
+# Chromium launch options by profile, picked with NEODOVE_LAUNCH_PROFILE or run_tests.py --profile
+LAUNCH_PROFILES = {
+    'headful-debug': {'headless': False},
+    'headless-fast': {'headless': True},
+    'headless-minimal': {
+        'headless': True,
+        'args': [
+            '--disable-gpu', '--disable-extensions', '--disable-background-networking',
+            '--disable-background-timer-throttling', '--disable-backgrounding-occluded-windows',
+            '--disable-renderer-backgrounding', '--disable-component-update', '--disable-default-apps',
+            '--disable-sync', '--no-first-run', '--mute-audio', '--disable-dev-shm-usage',
+        ],
+    },
+}
+LAUNCH_PROFILE = os.environ.get('NEODOVE_LAUNCH_PROFILE', 'headful-debug')
+LAUNCH_STATS_FILE = os.path.join('reports', 'launch_profiles.jsonl')
+# 'auto' connects to a browser started by browser_server.py when one is running, 'off' always launches.
+# The server needs POSIX process groups, other platforms always launch.
+BROWSER_SERVER = os.environ.get('NEODOVE_BROWSER_SERVER', 'auto')
 
+# Startup cost of the browsers launched by this process, see browser_setup()
+launch_stats = {}
 
-def browser_setup():
+from playwright.sync_api import sync_playwright, Error as PlaywrightError
+from har import install_har
+from network_filter import install_request_filter
+from pages import LoginPage
+from process_stats import browser_rss_mb
+from quiescence import track_quiescence, wait_for_quiet
+from steps import instrument_page
+from waits import wait_for_app_stable
+from web_metrics import install_metrics
+
+
+def browser_setup(profile=LAUNCH_PROFILE):
+    started = time.monotonic()
     playwright = sync_playwright().start()
-    browser = playwright.chromium.launch(headless=False)
+    driver_ms = round((time.monotonic() - started) * 1000, 1)
+    browser = None
+    if BROWSER_SERVER != 'off' and os.name == 'posix':
+        # Imported here, browser_server imports the launch profiles from this module
+        from browser_server import server_endpoint
+        server = server_endpoint(profile)
+        if server:
+            browser = connect_browser(playwright, server, profile)
+    if browser is None:
+        browser = launch_browser(playwright, profile)
+    launch_stats[id(browser)]['driver_ms'] = driver_ms
     return browser, playwright
 
 
+def connect_browser(playwright, server, profile=LAUNCH_PROFILE):
+    # Reuses a browser started by browser_server.py; closing it only disconnects
+    from browser_server import unregister_client
+    started = time.monotonic()
+    try:
+        browser = playwright.chromium.connect_over_cdp(server['endpoint'])
+    except PlaywrightError as e:
+        print(f"Could not connect to the browser server at {server['endpoint']}, launching a browser instead: {e}")
+        unregister_client()
+        return None
+    launch_stats[id(browser)] = {
+        'profile': f"{profile} (server)",
+        'worker': WORKER_ID,
+        'launch_ms': round((time.monotonic() - started) * 1000, 1),
+        'startup_rss_mb': browser_rss_mb(server['pid']),
+        'server_pid': server['pid'],
+    }
+    return browser
+
+
+def browser_root_pid(browser):
+    # Process whose tree holds the browser: the server's browser, or None for our own children
+    return launch_stats.get(id(browser), {}).get('server_pid')
+
+
+def launch_browser(playwright, profile=LAUNCH_PROFILE):
+    started = time.monotonic()
+    browser = playwright.chromium.launch(**LAUNCH_PROFILES[profile])
+    launch_stats[id(browser)] = {
+        'profile': profile,
+        'worker': WORKER_ID,
+        'launch_ms': round((time.monotonic() - started) * 1000, 1),
+        'startup_rss_mb': browser_rss_mb(),
+    }
+    return browser
+
+
+def record_launch_stats(stats, path=LAUNCH_STATS_FILE):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a') as f:
+        f.write(json.dumps(stats) + '\n')
+
+
+def new_context(browser, har_name=None, **kwargs):
+    # Every browser context the suite uses is created here
+    context = browser.new_context(**kwargs)
+    context.on('page', instrument_page)
+    context.on('page', track_quiescence)
+    install_metrics(context)
+    install_request_filter(context)
+    if har_name:
+        install_har(context, har_name)
+    return context
+
+
 def login(page):
-    page.goto(LOGIN_URL)
-    page.fill("input[name='username']", login_credentials['username'])
-    page.fill("input[name='password']", login_credentials['password'])
-    checkbox_label_selector = "label.mat-checkbox-layout span.mat-checkbox-inner-container"
-    page.click(checkbox_label_selector)
-    page.wait_for_function("() => !document.querySelector('button[type=submit]').disabled")
-    page.click("button[type='submit']")
+    login_page = LoginPage.of(page).open(LOGIN_URL)
+    login_page.fill_credentials(login_credentials['username'], login_credentials['password'])
+    login_page.accept_terms()
+    login_page.submit()
 
     # Handle the confirm login alert if it appears
     handle_confirm_login_alert(page)
 
-    page.wait_for_load_state('networkidle')
+    wait_for_quiet(page)
     page.goto(HOME_URL)
-    page.wait_for_load_state('networkidle')
+    wait_for_quiet(page)
     return page
 
 
+def token_init_script(token, base_url=BASE_URL):
+    # Runs before the app's own scripts on every page of the context, only on the app's origin
+    return (f"if (location.origin === new URL({json.dumps(base_url)}).origin) "
+            f"localStorage.setItem({json.dumps(TOKEN_STORAGE_KEY)}, {json.dumps(token)});")
+
+
+def api_login(context, credentials=None, login_url=AUTH_LOGIN_URL, confirm_url=AUTH_CONFIRM_URL, app_url=BASE_URL):
+    # context.request shares the context's cookie jar, so the session cookie set by
+    # the auth endpoint is already there when the first page opens. These requests skip
+    # the context's routes, so HAR recording and replay never see them.
+    credentials = credentials or login_credentials
+    try:
+        response = context.request.post(login_url, data={
+            'username': credentials['username'], 'password': credentials['password']})
+        body = response.json() if response.ok else {}
+        if body.get('confirm'):
+            response = context.request.post(confirm_url, data={'token': body.get('token')})
+    except (PlaywrightError, ValueError) as e:
+        print(f"API login failed, falling back to the login form: {e}")
+        return None
+    if not response.ok:
+        print(f"API login failed with status {response.status}, falling back to the login form")
+        return None
+    token = body.get('token')
+    if token:
+        context.add_init_script(token_init_script(token, app_url))
+    return token
+
+
 def handle_confirm_login_alert(page):
+    login_page = LoginPage.of(page)
     try:
-        page.wait_for_selector("text=Confirm Login", timeout=10000)
-        continue_button_selector = "button:has-text('Continue')"
-        page.click(continue_button_selector)
-        page.wait_for_timeout(2000)
+        login_page.confirm_login()
+        wait_for_app_stable(page, replaces=2000)
     except Exception as e:
         print(f"Confirmation popup did not appear or failed to click 'Continue': {e}")
 
 
-def close_browser(browser, playwright):
+def release_browser(browser):
+    stats = launch_stats.pop(id(browser), None)
+    if stats is not None:
+        stats['final_rss_mb'] = browser_rss_mb(stats.get('server_pid'))
+        stats['timestamp'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        record_launch_stats(stats)
     browser.close()
+    if stats is not None and stats.get('server_pid'):
+        from browser_server import unregister_client
+        unregister_client()
+
+
+def close_browser(browser, playwright):
+    release_browser(browser)
     playwright.stop()
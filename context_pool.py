@@ -0,0 +1,113 @@
+import os
+
+from playwright.sync_api import Error as PlaywrightError
+
+from constants import HOME_URL
+from har import HAR_MODE
+from navigation import go_home
+from session_cache import authenticated_context
+from waits import wait_for_app_stable
+
+# One page is leased at a time per process, raise it for code that leases several at once
+POOL_SIZE = int(os.environ.get('NEODOVE_POOL_SIZE', 1))
+POOL_MAX_USES = int(os.environ.get('NEODOVE_POOL_MAX_USES', 25))
+POOL_MAX_HEAP_MB = int(os.environ.get('NEODOVE_POOL_MAX_HEAP_MB', 300))
+
+HEAP_JS = "() => performance.memory ? performance.memory.usedJSHeapSize : 0"
+
+
+class PooledPage:
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.uses = 0
+        self.single_use = False
+
+
+class ContextPool:
+    def __init__(self, browser, size=POOL_SIZE, max_uses=POOL_MAX_USES, max_heap_mb=POOL_MAX_HEAP_MB):
+        self.browser = browser
+        self.size = size
+        self.max_uses = max_uses
+        self.max_heap_mb = max_heap_mb
+        self.stats = {'created': 0, 'reused': 0, 'recycled': 0}
+        self._idle = []
+        self._leased = []
+        if hasattr(browser, 'on_restart'):
+            # The browser is relaunched between tests when it gets too big, its contexts go with it
+            browser.on_restart(self.close)
+
+    def warm(self):
+        while len(self._idle) + len(self._leased) < self.size:
+            self._idle.append(self._new_entry())
+        return self
+
+    def lease(self, har_name=None):
+        if har_name and HAR_MODE != 'off':
+            # Archives are written per context, so recording or replaying needs a context of its own
+            entry = self._new_entry(har_name)
+            entry.single_use = True
+        elif self._idle:
+            entry = self._idle.pop()
+            self.stats['reused'] += 1
+        else:
+            entry = self._new_entry()
+        entry.uses += 1
+        self._leased.append(entry)
+        return entry
+
+    def release(self, entry):
+        self._leased.remove(entry)
+        if entry.single_use:
+            self._discard(entry)
+            return
+        if self._needs_recycling(entry) or not self._reset(entry):
+            self._discard(entry)
+            self.stats['recycled'] += 1
+            return
+        self._idle.append(entry)
+
+    def close(self):
+        for entry in self._idle + self._leased:
+            self._discard(entry)
+        self._idle = []
+        self._leased = []
+
+    def contexts(self):
+        return [entry.context for entry in self._idle + self._leased]
+
+    def _new_entry(self, har_name=None):
+        context, page = authenticated_context(self.browser, har_name=har_name)
+        wait_for_app_stable(page)
+        self.stats['created'] += 1
+        return PooledPage(context, page)
+
+    def _needs_recycling(self, entry):
+        if entry.uses >= self.max_uses or entry.page.is_closed():
+            return True
+        try:
+            heap_mb = entry.page.evaluate(HEAP_JS) / (1024 * 1024)
+        except PlaywrightError:
+            return True
+        return heap_mb >= self.max_heap_mb
+
+    def _reset(self, entry):
+        page = entry.page
+        try:
+            # Drop popups the test opened and dismiss any open Material dialog
+            for other in entry.context.pages:
+                if other is not page:
+                    other.close()
+            page.keyboard.press('Escape')
+            go_home(page)
+            return page.url == HOME_URL
+        except PlaywrightError as e:
+            print(f"Could not reset pooled page, recycling it: {e}")
+            return False
+
+    @staticmethod
+    def _discard(entry):
+        try:
+            entry.context.close()
+        except PlaywrightError:
+            pass
@@ -0,0 +1,65 @@
+import json
+import os
+import re
+import zipfile
+
+from network_filter import FILTER_PROFILE, FILTER_PROFILES, should_block
+
+# off: normal network, record: capture responses per test, replay: serve them from disk only
+HAR_MODE = os.environ.get('NEODOVE_HAR_MODE', 'off')
+HAR_DIR = os.environ.get('NEODOVE_HAR_DIR', 'hars')
+HAR_STRICT = os.environ.get('NEODOVE_HAR_STRICT', '0') == '1'
+
+# Per archive: requests made during replay and the ones the archive could not answer
+har_requests = {}
+har_misses = {}
+
+
+def har_name_for(node):
+    return re.sub(r'[^\w.-]', '_', node.name)
+
+
+def har_path(name):
+    return os.path.join(HAR_DIR, f"{name}.har.zip")
+
+
+def install_har(context, name, mode=HAR_MODE):
+    if mode == 'off':
+        return
+    path = har_path(name)
+    if mode == 'record':
+        os.makedirs(HAR_DIR, exist_ok=True)
+        context.route_from_har(path, update=True, update_content='attach', update_mode='minimal')
+        return
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No recorded HAR for '{name}' at {path}, run with NEODOVE_HAR_MODE=record first")
+    requested = har_requests.setdefault(name, set())
+    misses = har_misses.setdefault(name, [])
+    profile = FILTER_PROFILES[FILTER_PROFILE]
+
+    def catch_miss(route, request):
+        # Requests the filter blocked during recording were never archived
+        if profile is None or not should_block(profile, request.url, request.resource_type):
+            misses.append(f"{request.method} {request.url}")
+        route.abort('internetdisconnected')
+
+    context.on('request', lambda request: requested.add(f"{request.method} {request.url}"))
+    context.route('**/*', catch_miss)
+    context.route_from_har(path, not_found='fallback')
+
+
+def recorded_requests(name):
+    with zipfile.ZipFile(har_path(name)) as archive:
+        har_file = next(member for member in archive.namelist() if member.endswith('.har'))
+        har = json.loads(archive.read(har_file))
+    return {f"{entry['request']['method']} {entry['request']['url']}" for entry in har['log']['entries']}
+
+
+def check_har(name):
+    # A stale archive either misses requests the app now makes or holds ones it no longer makes.
+    # None when install_har() never replayed this archive, e.g. for tests against the stand-in.
+    if name not in har_requests or not os.path.exists(har_path(name)):
+        return None
+    unused = recorded_requests(name) - har_requests.get(name, set())
+    return {'missing': sorted(set(har_misses.get(name, []))), 'unused': sorted(unused)}
@@ -0,0 +1,32 @@
+import json
+import os
+import sys
+
+from constants import LAUNCH_STATS_FILE
+
+
+def summarize(path=LAUNCH_STATS_FILE):
+    # Average startup cost and memory of every launch profile recorded so far
+    profiles = {}
+    with open(path) as f:
+        for line in f:
+            stats = json.loads(line)
+            profiles.setdefault(stats['profile'], []).append(stats)
+
+    def average(records, key):
+        values = [r[key] for r in records if r.get(key) is not None]
+        return sum(values) / len(values) if values else float('nan')
+
+    rows = []
+    for profile, records in profiles.items():
+        rows.append((profile, len(records), average(records, 'driver_ms'), average(records, 'launch_ms'),
+                     average(records, 'startup_rss_mb'), average(records, 'final_rss_mb')))
+    return sorted(rows, key=lambda row: row[3])
+
+
+if __name__ == '__main__':
+    if not os.path.exists(LAUNCH_STATS_FILE):
+        sys.exit(f"No launch stats yet, run the suite first ({LAUNCH_STATS_FILE})")
+    print(f"{'profile':<18}{'runs':>6}{'driver ms':>11}{'launch ms':>11}{'start MB':>10}{'final MB':>10}")
+    for profile, runs, driver_ms, launch_ms, start_mb, final_mb in summarize():
+        print(f"{profile:<18}{runs:>6}{driver_ms:>11.0f}{launch_ms:>11.0f}{start_mb:>10.1f}{final_mb:>10.1f}")
@@ -0,0 +1,187 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+
+from benchmark import percentile
+
+LOAD_DIR = os.path.join('reports', 'load')
+# [{"username": ..., "password": ...}, ...], one account per virtual user, reused round robin
+ACCOUNTS_FILE = os.environ.get('NEODOVE_ACCOUNTS_FILE', 'accounts.json')
+
+
+def load_accounts(path, users, default):
+    if not os.path.exists(path):
+        print(f"No accounts file at {path}, every virtual user logs in as {default['username'] or 'the default user'}")
+        return [default] * users
+    with open(path) as f:
+        accounts = json.load(f)
+    if len(accounts) < users:
+        print(f"Only {len(accounts)} accounts for {users} virtual users, some users share an account")
+    return [accounts[index % len(accounts)] for index in range(users)]
+
+
+class LoadResults:
+    def __init__(self):
+        self.samples = []
+        self.started = time.monotonic()
+
+    async def timed(self, name, action):
+        started = time.monotonic()
+        try:
+            ok = await action()
+            error = None if ok else 'unexpected result'
+        except Exception as e:
+            ok, error = False, f"{type(e).__name__}: {e}"
+        self.samples.append({
+            'name': name,
+            'ok': bool(ok),
+            'error': error,
+            'at_s': round(started - self.started, 3),
+            'duration_ms': round((time.monotonic() - started) * 1000, 1),
+        })
+        return ok
+
+    def summary(self):
+        elapsed = time.monotonic() - self.started
+        by_name = {}
+        for sample in self.samples:
+            by_name.setdefault(sample['name'], []).append(sample)
+        flows = {}
+        for name, samples in by_name.items():
+            durations = [sample['duration_ms'] for sample in samples if sample['ok']] or [0]
+            errors = sum(1 for sample in samples if not sample['ok'])
+            flows[name] = {
+                'count': len(samples),
+                'errors': errors,
+                'error_rate': round(errors / len(samples), 4),
+                'throughput_per_s': round(len(samples) / elapsed, 2),
+                'p50_ms': round(percentile(durations, 50), 1),
+                'p95_ms': round(percentile(durations, 95), 1),
+                'p99_ms': round(percentile(durations, 99), 1),
+            }
+        total = len(self.samples)
+        errors = sum(1 for sample in self.samples if not sample['ok'])
+        return {
+            'duration_s': round(elapsed, 1),
+            'requests': total,
+            'throughput_per_s': round(total / elapsed, 2) if elapsed else 0,
+            'error_rate': round(errors / total, 4) if total else 0,
+            'flows': flows,
+        }
+
+
+async def virtual_user(index, browser, account, routes, deadline, results, ramp_up_s):
+    from async_helpers import api_login, login, navigate_route, new_context
+    from constants import HOME_URL, LOGIN_MODE, LOGIN_URL
+    from pages import SIDEBAR_SELECTORS
+
+    # Spread the logins so the users do not all hit the auth endpoint at once
+    await asyncio.sleep(ramp_up_s * index)
+    context = await new_context(browser)
+    try:
+        page = await context.new_page()
+
+        async def log_in():
+            if LOGIN_MODE == 'api' and await api_login(context, account):
+                await page.goto(HOME_URL)
+                if not page.url.startswith(LOGIN_URL):
+                    return True
+            await login(page, account)
+            return page.url == HOME_URL
+
+        if not await results.timed('login', log_in):
+            return
+
+        async def dashboard():
+            # Same check as test_dashboard: the account name is shown in the sidebar
+            await page.goto(HOME_URL)
+            return await page.locator(SIDEBAR_SELECTORS['account_name']).first.is_visible()
+
+        while time.monotonic() < deadline:
+            await results.timed('dashboard', dashboard)
+            for route in random.sample(routes, len(routes)):
+                if time.monotonic() >= deadline:
+                    break
+
+                async def navigate(route=route):
+                    return await navigate_route(page, route) == route['url']
+
+                if not await results.timed(route['name'], navigate):
+                    # Start the next route from a fresh load rather than from a broken page
+                    await page.goto(HOME_URL)
+    finally:
+        await context.close()
+
+
+async def run_load(users, duration_s, routes, accounts, ramp_up_s):
+    from async_helpers import browser_setup, close_browser
+
+    browser, playwright = await browser_setup()
+    results = LoadResults()
+    deadline = time.monotonic() + duration_s
+    try:
+        await asyncio.gather(*(
+            virtual_user(index, browser, accounts[index], routes, deadline, results, ramp_up_s)
+            for index in range(users)))
+    finally:
+        await close_browser(browser, playwright)
+    return results
+
+
+def print_summary(summary):
+    print(f"{'flow':>24} {'count':>6} {'err%':>6} {'/s':>6} {'p50':>7} {'p95':>7} {'p99':>7}")
+    for name, stats in sorted(summary['flows'].items()):
+        print(f"{name:>24} {stats['count']:>6} {stats['error_rate']:>6.1%} {stats['throughput_per_s']:>6.2f} "
+              f"{stats['p50_ms']:>5.0f}ms {stats['p95_ms']:>5.0f}ms {stats['p99_ms']:>5.0f}ms")
+    print(f"{summary['requests']} flows in {summary['duration_s']:.0f}s, {summary['throughput_per_s']:.2f}/s, "
+          f"{summary['error_rate']:.1%} errors")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate load with virtual users looping the login and navigation flows")
+    parser.add_argument('-u', '--users', type=int, default=5)
+    parser.add_argument('-d', '--duration', type=float, default=60, help="Seconds every user keeps looping")
+    parser.add_argument('--ramp-up', type=float, default=1.0, help="Seconds between two users starting")
+    parser.add_argument('--routes', nargs='+', help="Route names to visit, default all of routes.NAV_ROUTES")
+    parser.add_argument('--accounts', default=ACCOUNTS_FILE, help="JSON list of accounts, one per user")
+    parser.add_argument('--profile', default='headless-fast',
+                        help="Browser launch profile, see LAUNCH_PROFILES in constants.py")
+    parser.add_argument('--stand-in', action='store_true', help="Load the local stand-in server instead")
+    parser.add_argument('--stand-in-port', type=int, default=8765)
+    parser.add_argument('--stand-in-config', help="Latency config for the stand-in, see stand_in_server.py")
+    args = parser.parse_args(argv)
+
+    # Set before anything imports constants
+    os.environ['NEODOVE_LAUNCH_PROFILE'] = args.profile
+    if args.stand_in:
+        os.environ['NEODOVE_BASE_URL'] = f"http://127.0.0.1:{args.stand_in_port}"
+        # The stand-in implements the auth endpoints, see LOGIN_MODE in constants.py
+        os.environ.setdefault('NEODOVE_LOGIN_MODE', 'api')
+        from stand_in_server import LatencyProfile, start_stand_in
+        latency = LatencyProfile.from_file(args.stand_in_config) if args.stand_in_config else None
+        stand_in = start_stand_in(port=args.stand_in_port, latency=latency)
+        print(f"Loading the stand-in at {stand_in.base_url}")
+
+    from constants import login_credentials
+    from routes import NAV_ROUTES
+    routes = [route for route in NAV_ROUTES if not args.routes or route['name'] in args.routes]
+    accounts = load_accounts(args.accounts, args.users, login_credentials)
+
+    results = asyncio.run(run_load(args.users, args.duration, routes, accounts, args.ramp_up))
+    summary = results.summary()
+    print_summary(summary)
+
+    os.makedirs(LOAD_DIR, exist_ok=True)
+    path = os.path.join(LOAD_DIR, f"load_{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, 'w') as f:
+        json.dump({'users': args.users, 'target': os.environ.get('NEODOVE_BASE_URL', 'https://connect.neodove.com'),
+                   'summary': summary, 'samples': results.samples}, f, indent=2)
+    print(f"Wrote {path}")
+    return 1 if summary['error_rate'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
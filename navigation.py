@@ -0,0 +1,119 @@
+from playwright.sync_api import Error as PlaywrightError
+
+from constants import BASE_URL, HOME_URL, LOGIN_URL
+from pages import SIDEBAR_MENUS, SIDEBAR_ITEMS, Sidebar
+from quiescence import wait_for_quiet
+from steps import step
+from throttling import scaled
+from waits import wait_for_app_stable, wait_for_menu_expanded, wait_for_route
+
+# Soft navigation through the Angular router, the bundle and app state stay loaded
+SOFT_NAVIGATE_JS = """(url) => {
+    history.pushState(null, '', url);
+    window.dispatchEvent(new PopStateEvent('popstate', {state: null}));
+}"""
+
+navigation_stats = {'reloads_avoided': 0, 'hard_reloads': 0}
+# Menus the old flow reached by reloading the home page first, see reloads_avoided
+RELOADED_MENUS = ('Reports',)
+# Fixed sleeps the old flow had after each menu expansion and route change, by top menu
+REPLACED_SLEEP_MS = {'Reports': 2000}
+DEFAULT_SLEEP_MS = 3000
+
+
+def menu_chain(menu):
+    chain = []
+    while menu:
+        chain.insert(0, menu)
+        menu = SIDEBAR_MENUS[menu]['parent']
+    return chain
+
+
+def route_steps(route):
+    # Selectors clicked from a collapsed sidebar to reach the route
+    return [SIDEBAR_MENUS[menu]['toggle'] for menu in menu_chain(route['menu'])] + [SIDEBAR_ITEMS[route['item']]]
+
+
+def replaced_sleep(menu):
+    top = menu_chain(menu)[0] if menu else None
+    return REPLACED_SLEEP_MS.get(top, DEFAULT_SLEEP_MS)
+
+
+def is_app_healthy(page, timeout=2000):
+    if page.is_closed() or page.url.startswith(LOGIN_URL) or not page.url.startswith(BASE_URL):
+        return False
+    try:
+        Sidebar.of(page).account_name.wait_for(timeout=scaled(page, timeout))
+        return True
+    except PlaywrightError:
+        return False
+
+
+def hard_reload(page, url=HOME_URL):
+    navigation_stats['hard_reloads'] += 1
+    page.goto(url)
+    wait_for_app_stable(page)
+
+
+def collapse_other_menus(sidebar, keep):
+    for name, menu in SIDEBAR_MENUS.items():
+        if menu['parent'] is None and name not in keep and sidebar.is_expanded(name):
+            sidebar.toggle(name).click()
+
+
+def open_menu(page, menu, timeout=20000):
+    sidebar = Sidebar.of(page).validate(timeout=timeout)
+    chain = menu_chain(menu)
+    collapse_other_menus(sidebar, keep=chain)
+    for name in chain:
+        # Clicking an expanded menu would collapse it again
+        if sidebar.is_expanded(name):
+            continue
+        with step(f"expand {name}"):
+            sidebar.toggle(name).click(timeout=scaled(page, timeout))
+            wait_for_menu_expanded(page, SIDEBAR_MENUS[name]['probe'], timeout=timeout, replaces=replaced_sleep(name))
+
+
+def go_home(page, timeout=5000):
+    if page.url == HOME_URL:
+        return
+    if is_app_healthy(page):
+        try:
+            page.evaluate(SOFT_NAVIGATE_JS, HOME_URL)
+            page.wait_for_url(HOME_URL, timeout=scaled(page, timeout))
+            wait_for_app_stable(page)
+            navigation_stats['reloads_avoided'] += 1
+            return
+        except PlaywrightError as e:
+            print(f"Soft navigation home failed, reloading: {e}")
+    hard_reload(page)
+
+
+def navigate_to(page, route, timeout=20000):
+    with step(f"navigate {route['name']}"):
+        reloaded = not is_app_healthy(page)
+        if reloaded:
+            hard_reload(page)
+        try:
+            if route['menu']:
+                open_menu(page, route['menu'], timeout=timeout)
+        except PlaywrightError as e:
+            # Menus did not respond, the app state is broken: start over from a fresh load
+            print(f"Sidebar did not respond while opening {route['menu']}, reloading: {e}")
+            reloaded = True
+            hard_reload(page)
+            if route['menu']:
+                open_menu(page, route['menu'], timeout=timeout)
+        if route['menu'] and menu_chain(route['menu'])[0] in RELOADED_MENUS and not reloaded:
+            navigation_stats['reloads_avoided'] += 1
+        # Locator clicks wait for the item to be visible, enabled and done animating
+        with step(f"click {route['item']}"):
+            Sidebar.of(page).item(route['item']).click(timeout=scaled(page, timeout))
+        # The router may update the URL after the click's requests have settled
+        try:
+            wait_for_route(page, route['url'], timeout=timeout, replaces=replaced_sleep(route['menu']))
+        except PlaywrightError as e:
+            # Left to the caller's URL check, which reports where the click did land
+            print(f"Navigation to {route['name']} did not reach {route['url']}: {e}")
+        wait_for_quiet(page)
+    return page.url
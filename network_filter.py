@@ -0,0 +1,128 @@
+import functools
+import ipaddress
+import json
+import os
+from urllib.parse import urlsplit
+
+FILTER_PROFILE = os.environ.get('NEODOVE_FILTER_PROFILE', 'default')
+REQUEST_SIZES_FILE = '.request_sizes.json'
+
+# The app's own domain (taken from BASE_URL) and allow_domains are first party: only their
+# deny_resource_types are blocked. Everything else is blocked by resource type, by deny_domains, or entirely with block_third_party.
+FILTER_PROFILES = {
+    'off': None,
+    'default': {
+        'allow_domains': [],
+        'deny_domains': [
+            'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'facebook.net',
+            'hotjar.com', 'clarity.ms', 'intercom.io', 'intercomcdn.com', 'freshchat.com',
+            'tawk.to', 'fonts.googleapis.com', 'fonts.gstatic.com',
+        ],
+        'deny_resource_types': ['image', 'media', 'font'],
+        'block_third_party': False,
+    },
+    'strict': {
+        'allow_domains': [],
+        'deny_domains': [],
+        'deny_resource_types': ['image', 'media', 'font', 'stylesheet'],
+        'block_third_party': True,
+    },
+}
+
+# Totals for this process, conftest.py reports the per-test difference
+filter_stats = {'blocked': 0, 'blocked_bytes': 0, 'unknown_size': 0}
+
+_request_sizes = None
+
+
+def _matches(host, domains):
+    return any(host == domain or host.endswith(f".{domain}") for domain in domains)
+
+
+def _size_key(url):
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}"
+
+
+def load_request_sizes(path=REQUEST_SIZES_FILE):
+    global _request_sizes
+    if _request_sizes is None:
+        _request_sizes = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                _request_sizes = json.load(f)
+    return _request_sizes
+
+
+def save_request_sizes(path=REQUEST_SIZES_FILE):
+    if _request_sizes:
+        with open(path, 'w') as f:
+            json.dump(_request_sizes, f, indent=2, sort_keys=True)
+
+
+@functools.lru_cache(maxsize=None)
+def app_domain():
+    # connect.neodove.com -> neodove.com, a stand-in on 127.0.0.1 or localhost stays as it is
+    from constants import BASE_URL  # constants imports this module
+    host = urlsplit(BASE_URL).hostname or ''
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        return '.'.join(host.split('.')[-2:])
+
+
+def should_block(profile, url, resource_type):
+    host = urlsplit(url).hostname or ''
+    if resource_type in profile['deny_resource_types']:
+        return True
+    if _matches(host, [app_domain()] + profile['allow_domains']):
+        return False
+    return profile['block_third_party'] or _matches(host, profile['deny_domains'])
+
+
+def _record_blocked(url):
+    filter_stats['blocked'] += 1
+    size = load_request_sizes().get(_size_key(url))
+    if size is None:
+        filter_stats['unknown_size'] += 1
+    else:
+        filter_stats['blocked_bytes'] += size
+
+
+def _learn_size(request):
+    # Only unfiltered runs see these responses, they provide the byte estimates for blocked requests
+    sizes = request.sizes()
+    load_request_sizes()[_size_key(request.url)] = sizes['responseBodySize']
+
+
+def install_request_filter(context, profile_name=FILTER_PROFILE):
+    profile = FILTER_PROFILES[profile_name]
+    if profile is None:
+        context.on('requestfinished', _learn_size)
+        return
+
+    def handle(route, request):
+        if should_block(profile, request.url, request.resource_type):
+            _record_blocked(request.url)
+            route.abort('blockedbyclient')
+        else:
+            route.fallback()
+
+    context.route('**/*', handle)
+
+
+async def install_request_filter_async(context, profile_name=FILTER_PROFILE):
+    # Same profiles for playwright.async_api contexts, used by async_helpers.py
+    profile = FILTER_PROFILES[profile_name]
+    if profile is None:
+        return
+
+    async def handle(route, request):
+        if should_block(profile, request.url, request.resource_type):
+            _record_blocked(request.url)
+            await route.abort('blockedbyclient')
+        else:
+            await route.fallback()
+
+    await context.route('**/*', handle)
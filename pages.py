@@ -0,0 +1,189 @@
+from playwright.sync_api import Error as PlaywrightError
+
+from steps import step
+from throttling import scaled
+
+# Login form and confirm dialog. Also used by async_helpers.py, which drives raw pages.
+LOGIN_SELECTORS = {
+    'title': "div.title",
+    'username': "input[name='username']",
+    'password': "input[name='password']",
+    'terms_checkbox': "label.mat-checkbox-layout span.mat-checkbox-inner-container",
+    'submit_button': "button[type='submit']",
+    'confirm_dialog': "text=Confirm Login",
+    'continue_button': "button:has-text('Continue')",
+}
+
+# Sidebar header, menus and items below
+SIDEBAR_SELECTORS = {
+    'account_name': "span.nd-logo-text",
+    'dashboard': "span.mat-button-wrapper.pl-7.ng-trigger.ng-trigger-animateText",
+}
+
+# Sidebar menus that expand in place. 'toggle' opens or closes the menu,
+# 'probe' is an item that is only visible while it is expanded.
+SIDEBAR_MENUS = {
+    'Pipeline': {
+        'parent': None,
+        'toggle': "span.mat-button-wrapper.pl-7.mb-2.ng-trigger.ng-trigger-animateText",
+        'probe': "span.mat-button-wrapper.pl-7:has-text('Sales')",
+    },
+    'Trends': {
+        'parent': None,
+        'toggle': "span.mat-button-wrapper.pl-7.mb-2.ng-trigger.ng-trigger-animateText >> text=Trends",
+        'probe': "span.mat-button-wrapper.pl-7:has-text('Business Trend')",
+    },
+    'Reports': {
+        'parent': None,
+        'toggle': "span.mat-button-wrapper.pl-7.mb-2:has-text('Reports')",
+        'probe': "span.mat-button-wrapper.pl-5:has-text('Download Logs')",
+    },
+    'Reports > User': {
+        'parent': 'Reports',
+        'toggle': "a#nd-user-report span.mat-button-wrapper.pl-7.mb-2:has-text('User')",
+        'probe': "span.mat-button-wrapper.pl-7:has-text('Call Report')",
+    },
+    'Reports > Campaign': {
+        'parent': 'Reports',
+        'toggle': "span.mat-button-wrapper.pl-5:has-text('Campaign')",
+        'probe': "span.mat-button-wrapper.pl-7:has-text('Campaign Report')",
+    },
+}
+
+# Sidebar entries that navigate, by the label shown in the app
+SIDEBAR_ITEMS = {
+    'Contacts': "a[title='Contacts'] span.mat-button-wrapper:has-text('Contacts')",
+    'Sales': "span.mat-button-wrapper.pl-7:has-text('Sales')",
+    'Service': "span.mat-button-wrapper.pl-7:has-text('Service')",
+    'Reminder': "span.mat-button-wrapper.pl-7:has-text('Reminder')",
+    'Feedback': "span.mat-button-wrapper.pl-7:has-text('Feedback')",
+    'Other': "span.mat-button-wrapper.pl-7:has-text('Other')",
+    'Testing Pipeline': "span.mat-button-wrapper.pl-7:has-text('Testing Pipeline')",
+    'COKO NOKO': "span.mat-button-wrapper.pl-7:has-text('COKO NOKO')",
+    'New Pipeline': "span.mat-button-wrapper.pl-7:has-text('New Pipeline')",
+    'View all': "b:has-text('View all')",
+    'Integrations': "a[title='Integrations'] span.mat-button-wrapper:has-text('Integrations')",
+    'Business Trend': "span.mat-button-wrapper.pl-7:has-text('Business Trend')",
+    'Users Trend': "span.mat-button-wrapper.pl-7:has-text('Users Trend')",
+    'Call Report': "span.mat-button-wrapper.pl-7:has-text('Call Report')",
+    'Login Report': "span.mat-button-wrapper.pl-7:has-text('Login Report')",
+    'Follow-up Report': "span.mat-button-wrapper.pl-7:has-text('Follow-up Report')",
+    'Campaign Report': "span.mat-button-wrapper.pl-7:has-text('Campaign Report')",
+    'Campaign Lead Report': "span.mat-button-wrapper.pl-7:has-text('Campaign Lead Report')",
+    'Download Logs': "span.mat-button-wrapper.pl-5:has-text('Download Logs')",
+    'Marketplace': "a[title='Marketplace'] span.mat-button-wrapper:has-text('Marketplace')",
+    'SMS Automation': "a[title='SMS Automation'] span.mat-button-wrapper:has-text('SMS Automation')",
+    'Workflow': "a[routerlink='/workflow'] span.mat-button-wrapper:has-text('Workflow')",
+    'Settings': "a[title='Settings'] span.mat-button-wrapper:has-text('Settings')",
+}
+
+
+def _track_loads(page):
+    # Counts full page loads, page objects validate their selectors once per load
+    if getattr(page, '_load_count', None) is None:
+        page._load_count = 0
+
+        def loaded(_):
+            page._load_count += 1
+        page.on('domcontentloaded', loaded)
+    return page._load_count
+
+
+class PageObject:
+    # Attribute names of locators that must exist once the page has loaded
+    REQUIRED = ()
+
+    def __init__(self, page):
+        self.page = page
+        self._validated_load = None
+        _track_loads(page)
+
+    @classmethod
+    def of(cls, page):
+        # One page object per page, so locators and validation are shared by every test using it
+        cache = getattr(page, '_page_objects', None)
+        if cache is None:
+            cache = page._page_objects = {}
+        if cls not in cache:
+            cache[cls] = cls(page)
+        return cache[cls]
+
+    def locator(self, selector):
+        # Matches page.click's behaviour of acting on the first match
+        return self.page.locator(selector).first
+
+    def validate(self, timeout=20000):
+        if self._validated_load == self.page._load_count:
+            return self
+        for name in self.REQUIRED:
+            try:
+                getattr(self, name).wait_for(state='attached', timeout=scaled(self.page, timeout))
+            except PlaywrightError:
+                raise AssertionError(f"{type(self).__name__}.{name} was not found on {self.page.url}, "
+                                     f"its selector in pages.py needs updating")
+        self._validated_load = self.page._load_count
+        return self
+
+
+class LoginPage(PageObject):
+    REQUIRED = ('title', 'username', 'password', 'terms_checkbox', 'submit_button')
+
+    def __init__(self, page):
+        super().__init__(page)
+        self.title = self.locator(LOGIN_SELECTORS['title'])
+        self.username = self.locator(LOGIN_SELECTORS['username'])
+        self.password = self.locator(LOGIN_SELECTORS['password'])
+        self.terms_checkbox = self.locator(LOGIN_SELECTORS['terms_checkbox'])
+        self.submit_button = self.locator(LOGIN_SELECTORS['submit_button'])
+        self.confirm_dialog = self.locator(LOGIN_SELECTORS['confirm_dialog'])
+        self.continue_button = self.locator(LOGIN_SELECTORS['continue_button'])
+
+    def open(self, url):
+        self.page.goto(url)
+        return self.validate()
+
+    # Locator actions bypass the page methods steps.instrument_page() times, so they are steps here
+    def fill_credentials(self, username, password):
+        with step("fill credentials"):
+            self.username.fill(username)
+            self.password.fill(password)
+
+    def accept_terms(self):
+        with step("accept terms"):
+            self.terms_checkbox.click()
+
+    def submit(self):
+        # click() waits for the button to become enabled once the terms are accepted
+        with step("submit login"):
+            self.submit_button.click()
+
+    def confirm_login(self, timeout=10000):
+        with step("confirm login"):
+            self.confirm_dialog.wait_for(timeout=scaled(self.page, timeout))
+            self.continue_button.click()
+
+    def error_message(self, text, timeout=20000):
+        error = self.locator(f'//span[contains(text(), "{text}")]')
+        with step("read login error"):
+            return error.text_content(timeout=scaled(self.page, timeout)).strip()
+
+
+class Sidebar(PageObject):
+    REQUIRED = ('account_name', 'dashboard')
+
+    def __init__(self, page):
+        super().__init__(page)
+        self.account_name = self.locator(SIDEBAR_SELECTORS['account_name'])
+        self.dashboard = self.locator(SIDEBAR_SELECTORS['dashboard'])
+        self._toggles = {name: self.locator(menu['toggle']) for name, menu in SIDEBAR_MENUS.items()}
+        self._probes = {name: self.locator(menu['probe']) for name, menu in SIDEBAR_MENUS.items()}
+        self._items = {name: self.locator(selector) for name, selector in SIDEBAR_ITEMS.items()}
+
+    def toggle(self, menu):
+        return self._toggles[menu]
+
+    def is_expanded(self, menu):
+        return self._probes[menu].is_visible()
+
+    def item(self, name):
+        return self._items[name]
@@ -0,0 +1,41 @@
+import os
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+BROWSER_PROCESS_NAMES = ('chrome', 'chromium', 'headless_shell')
+
+
+def browser_processes(root_pid=None):
+    # Browsers are launched by the Playwright driver, so they are descendants of this process.
+    # The root itself counts when it is a browser, e.g. the one started by browser_server.py.
+    if psutil is None:
+        return []
+    processes = []
+    try:
+        root = psutil.Process(root_pid or os.getpid())
+        candidates = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return []
+    for child in candidates:
+        try:
+            name = child.name().lower()
+        except psutil.Error:
+            continue
+        if any(browser_name in name for browser_name in BROWSER_PROCESS_NAMES):
+            processes.append(child)
+    return processes
+
+
+def browser_rss_mb(root_pid=None):
+    if psutil is None:
+        return None
+    total = 0
+    for process in browser_processes(root_pid):
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            continue
+    return round(total / (1024 * 1024), 1)
@@ -0,0 +1,127 @@
+import os
+import re
+import time
+from urllib.parse import urlsplit
+
+from steps import step
+from throttling import scaled
+
+# Requests that have to finish before the page counts as settled: app XHR/fetch calls to the API.
+# Polling, websockets and analytics beacons are ignored. Both are comma separated regexes.
+QUIET_INCLUDE = os.environ.get('NEODOVE_QUIET_INCLUDE', r'/api/')
+QUIET_IGNORE = os.environ.get('NEODOVE_QUIET_IGNORE', r'/poll,/heartbeat,/socket\.io/,/sockjs,analytics,collect\?,beacon,/track')
+QUIET_RESOURCE_TYPES = ('xhr', 'fetch')
+# How long nothing may be in flight before the page counts as settled
+QUIET_WINDOW_MS = int(os.environ.get('NEODOVE_QUIET_WINDOW_MS', 100))
+POLL_MS = 25
+
+# Requests that kept a wait from settling, by URL without the query string, see slowest_requests()
+quiet_stats = {'waits': 0, 'waited_ms': 0, 'timeouts': 0, 'delayed_by': {}}
+
+
+def _patterns(value):
+    return [re.compile(pattern) for pattern in value.split(',') if pattern]
+
+
+def _short_url(url):
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}"
+
+
+class QuiescenceTracker:
+    def __init__(self, page, include=QUIET_INCLUDE, ignore=QUIET_IGNORE):
+        self.page = page
+        self.include = _patterns(include)
+        self.ignore = _patterns(ignore)
+        self.in_flight = {}
+        self.finished = []
+        page.on('request', self._started)
+        page.on('requestfinished', self._ended)
+        page.on('requestfailed', self._ended)
+
+    def matters(self, request):
+        # A navigation of the page itself always counts, e.g. the redirect after confirming the login
+        if request.resource_type == 'document' and request.is_navigation_request():
+            return request.frame == self.page.main_frame
+        if request.resource_type not in QUIET_RESOURCE_TYPES:
+            return False
+        url = request.url
+        return any(p.search(url) for p in self.include) and not any(p.search(url) for p in self.ignore)
+
+    def _started(self, request):
+        if self.matters(request):
+            self.in_flight[request] = time.monotonic()
+
+    def _ended(self, request):
+        started = self.in_flight.pop(request, None)
+        if started is not None:
+            self.finished.append((request.url, time.monotonic()))
+
+    def settled_for(self, since, now):
+        # Seconds without tracked traffic since `since`, None while a request is still in flight.
+        # Counting from the start of the wait gives a click's first request time to go out.
+        if self.in_flight:
+            return None
+        return now - max([since] + [end for _, end in self.finished])
+
+    def _blame(self, started):
+        # The request that ended last kept the wait going, credit it with the time waited
+        during = [(url, end) for url, end in self.finished if end >= started]
+        if during:
+            url, end = max(during, key=lambda finished: finished[1])
+            delayed_by = quiet_stats['delayed_by']
+            delayed_by[_short_url(url)] = delayed_by.get(_short_url(url), 0) + (end - started) * 1000
+        self.finished = []
+
+    def _done(self, started, timeout):
+        now = time.monotonic()
+        settled = self.settled_for(started, now)
+        if settled is not None and settled * 1000 >= QUIET_WINDOW_MS:
+            return True
+        if (now - started) * 1000 < timeout:
+            return False
+        quiet_stats['timeouts'] += 1
+        pending = ', '.join(_short_url(request.url) for request in self.in_flight)
+        print(f"Network did not settle within {timeout}ms, still waiting for: {pending}")
+        return True
+
+    def _record(self, started):
+        self._blame(started)
+        quiet_stats['waits'] += 1
+        quiet_stats['waited_ms'] += (time.monotonic() - started) * 1000
+
+    def wait(self, timeout=20000):
+        timeout = scaled(self.page, timeout)
+        started = time.monotonic()
+        with step("wait for quiet network"):
+            # wait_for_timeout lets Playwright dispatch the request events while we wait
+            while not self._done(started, timeout):
+                self.page.wait_for_timeout(POLL_MS)
+        self._record(started)
+
+    async def wait_async(self, timeout=20000):
+        timeout = scaled(self.page, timeout)
+        started = time.monotonic()
+        while not self._done(started, timeout):
+            await self.page.wait_for_timeout(POLL_MS)
+        self._record(started)
+
+
+def track_quiescence(page):
+    if getattr(page, '_quiescence', None) is None:
+        page._quiescence = QuiescenceTracker(page)
+    return page._quiescence
+
+
+def wait_for_quiet(page, timeout=20000):
+    # Replaces wait_for_load_state('networkidle'): returns once the tracked API calls have finished
+    # instead of after 500ms without any traffic at all
+    track_quiescence(page).wait(timeout)
+
+
+async def wait_for_quiet_async(page, timeout=20000):
+    await track_quiescence(page).wait_async(timeout)
+
+
+def slowest_requests(limit=5):
+    return sorted(quiet_stats['delayed_by'].items(), key=lambda item: item[1], reverse=True)[:limit]
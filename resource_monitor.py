@@ -0,0 +1,123 @@
+import os
+import threading
+
+from constants import browser_root_pid, close_browser, launch_browser, release_browser, LAUNCH_PROFILE
+from process_stats import psutil, browser_processes
+
+MEMORY_LIMIT_MB = int(os.environ.get('NEODOVE_BROWSER_MEMORY_LIMIT_MB', 1500))
+SAMPLE_INTERVAL = float(os.environ.get('NEODOVE_RESOURCE_SAMPLE_INTERVAL', 0.5))
+
+
+class ManagedBrowser:
+    # Stands in for the Browser so it can be relaunched between tests without the fixtures noticing
+    def __init__(self, browser, playwright, profile=LAUNCH_PROFILE):
+        self.browser = browser
+        self.playwright = playwright
+        self.profile = profile
+        self.restarts = 0
+        self._restart_callbacks = []
+
+    def __getattr__(self, name):
+        return getattr(self.browser, name)
+
+    def on_restart(self, callback):
+        self._restart_callbacks.append(callback)
+
+    def restart(self, reason):
+        print(f"Restarting browser: {reason}")
+        for callback in self._restart_callbacks:
+            callback()
+        # A bloated shared server is left to browser_server.py, which restarts it once nobody is attached
+        release_browser(self.browser)
+        self.browser = launch_browser(self.playwright, self.profile)
+        self.restarts += 1
+
+    def close(self):
+        close_browser(self.browser, self.playwright)
+
+
+class ResourceSampler(threading.Thread):
+    # Samples RSS and CPU of the browser process tree while a test runs. psutil only, no Playwright calls.
+    def __init__(self, root_pid=None, interval=SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.root_pid = root_pid
+        self.interval = interval
+        self.samples = []
+        self._processes = {}
+        self._stop_event = threading.Event()
+
+    def _sample(self):
+        rss = 0
+        cpu = 0.0
+        for process in browser_processes(self.root_pid):
+            # Keep the Process objects, cpu_percent() measures since the previous call on the same object
+            process = self._processes.setdefault(process.pid, process)
+            try:
+                rss += process.memory_info().rss
+                cpu += process.cpu_percent(None)
+            except psutil.Error:
+                continue
+        self.samples.append((rss / (1024 * 1024), cpu))
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self._sample()
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join(timeout=self.interval * 4)
+        if not self.samples:
+            return {}
+        return {
+            'peak_rss_mb': round(max(rss for rss, _ in self.samples), 1),
+            'final_rss_mb': round(self.samples[-1][0], 1),
+            'avg_cpu_percent': round(sum(cpu for _, cpu in self.samples) / len(self.samples), 1),
+        }
+
+
+def open_pages(browser, skip=()):
+    return {context: len(context.pages) for context in browser.contexts if context not in skip}
+
+
+class ResourceWatch:
+    # Used by the autouse fixture in conftest.py: samples while the test runs, compares open
+    # contexts and pages before and after it, and restarts a bloated browser.
+    # owned() lists contexts kept open on purpose, e.g. by the context pool.
+    def __init__(self, browser, owned=list):
+        self.browser = browser
+        self.owned = owned
+        root_pid = browser_root_pid(getattr(browser, 'browser', browser))
+        # On a shared browser server the default context collects pages of contexts Playwright
+        # does not own, e.g. other runs', and the process tree is the whole server's
+        self.shared = root_pid is not None
+        self.skip = browser.contexts[:1] if self.shared else []
+        self.sampler = ResourceSampler(root_pid) if psutil is not None else None
+        self.before = {}
+
+    def start(self):
+        self.before = open_pages(self.browser, self.skip)
+        if self.sampler:
+            self.sampler.start()
+        return self
+
+    def finish(self, name):
+        usage = self.sampler.stop() if self.sampler else {}
+        if self.shared:
+            usage['shared_server_rss'] = True
+        after = open_pages(self.browser, self.skip)
+
+        kept = self.owned()
+        leaked = [context for context in after if context not in self.before and context not in kept]
+        usage['leaked_contexts'] = len(leaked)
+        usage['leaked_pages'] = sum(after[context] for context in leaked) + sum(
+            max(0, after[context] - self.before[context]) for context in after if context in self.before)
+        # Close what the test left behind so the leak does not carry into the next test
+        for context in leaked:
+            context.close()
+
+        # A bloated server is restarted by browser_server.py once no other run is attached
+        if not self.shared and usage.get('final_rss_mb', 0) > MEMORY_LIMIT_MB and isinstance(self.browser, ManagedBrowser):
+            self.browser.restart(f"browser RSS {usage['final_rss_mb']:.0f}MB is over {MEMORY_LIMIT_MB}MB after {name}")
+            usage['browser_restarted'] = True
+        return usage
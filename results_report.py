@@ -0,0 +1,125 @@
+import argparse
+import glob
+import html
+import json
+import os
+import time
+
+from results_sink import RESULTS_DIR
+
+
+class Aggregator:
+    # Folds result lines into a summary, reading only what was appended since the last call.
+    # The state is saved next to the results file so a later call picks up where this one stopped.
+    def __init__(self, path):
+        self.path = path
+        self.state_path = path + '.state.json'
+        self.state = {'offset': 0, 'tests': {}, 'steps': {}, 'workers': [], 'started': None, 'finished': None}
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                self.state = json.load(f)
+
+    def feed(self):
+        with open(self.path, 'rb') as f:
+            f.seek(self.state['offset'])
+            data = f.read()
+        # A run that died mid-write leaves a partial last line, it is read once it is complete
+        complete = data[:data.rfind(b'\n') + 1]
+        for line in complete.splitlines():
+            self._apply(json.loads(line))
+        self.state['offset'] += len(complete)
+        with open(self.state_path, 'w') as f:
+            json.dump(self.state, f)
+        return len(complete)
+
+    def _apply(self, record):
+        event = record['event']
+        if event == 'run_start':
+            self.state['started'] = self.state['started'] or record['time']
+            if record['worker'] not in self.state['workers']:
+                self.state['workers'].append(record['worker'])
+        elif event == 'run_end':
+            self.state['finished'] = record['time']
+        elif event == 'step':
+            # Steps of a test are kept until its test line arrives, a retried test starts over
+            self.state['steps'].setdefault(record['nodeid'], []).append(
+                {'label': record['label'], 'duration_ms': record['duration_ms'], 'depth': record['depth']})
+        elif event == 'test':
+            record['steps'] = self.state['steps'].pop(record['nodeid'], [])
+            self.state['tests'][record['nodeid']] = record
+
+    def summary(self):
+        tests = self.state['tests'].values()
+        counts = {}
+        for test in tests:
+            counts[test['outcome']] = counts.get(test['outcome'], 0) + 1
+        last = max((test['time'] for test in tests), default=self.state['started'])
+        return {
+            'tests': len(self.state['tests']),
+            'counts': counts,
+            'running': self.state['finished'] is None,
+            'elapsed_s': round((self.state['finished'] or last or 0) - (self.state['started'] or 0), 1),
+            'slowest': sorted(((t['nodeid'], t['duration_ms']) for t in tests), key=lambda t: t[1], reverse=True)[:10],
+            'failed': [(t['nodeid'], t['failed_in'], t['message']) for t in tests if t['outcome'] == 'failed'],
+        }
+
+    def render_html(self):
+        summary = self.summary()
+        status = 'running' if summary['running'] else 'finished'
+        rows = []
+        for test in sorted(self.state['tests'].values(), key=lambda t: t['time']):
+            colour = {'passed': '#27ae60', 'failed': '#c0392b'}.get(test['outcome'], '#7f8c8d')
+            steps = ''.join(f'<div style="padding-left:{s["depth"] * 12}px">{html.escape(s["label"])} '
+                            f'{s["duration_ms"]:.0f} ms</div>' for s in test['steps'])
+            rows.append(
+                f'<tr><td>{html.escape(test["nodeid"])}</td><td style="color:{colour}">{test["outcome"]}</td>'
+                f'<td style="text-align:right">{test["duration_ms"]:.0f} ms</td>'
+                f'<td>{html.escape(test["message"] or "")}<details><summary>{len(test["steps"])} steps</summary>'
+                f'{steps}</details></td></tr>')
+        counts = ', '.join(f"{count} {outcome}" for outcome, count in sorted(summary['counts'].items()))
+        return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>Neodove results</title></head>'
+                f'<body style="font-family:sans-serif;font-size:13px"><h1>Neodove results ({status})</h1>'
+                f'<p>{summary["tests"]} tests in {summary["elapsed_s"]:.0f}s: {counts}</p>'
+                f'<table style="width:100%"><tr><th>Test</th><th>Outcome</th><th>Duration</th><th>Details</th></tr>'
+                + ''.join(rows) + '</table></body></html>')
+
+    def write_views(self):
+        base = self.path[:-len('.jsonl')]
+        with open(base + '.html', 'w') as f:
+            f.write(self.render_html())
+        with open(base + '.summary.json', 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+        return base + '.html'
+
+
+def latest_results():
+    paths = sorted(glob.glob(os.path.join(RESULTS_DIR, '*.jsonl')), key=os.path.getmtime)
+    return paths[-1] if paths else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the HTML and summary views from a streamed results file")
+    parser.add_argument('path', nargs='?', help="Results file, default the latest in reports/results")
+    parser.add_argument('--watch', type=float, metavar='SECONDS',
+                        help="Keep updating the views every SECONDS until the run has finished")
+    args = parser.parse_args(argv)
+
+    path = args.path or latest_results()
+    if path is None:
+        raise SystemExit(f"No results in {RESULTS_DIR} yet, run the suite first")
+    aggregator = Aggregator(path)
+    while True:
+        aggregator.feed()
+        html_path = aggregator.write_views()
+        summary = aggregator.summary()
+        print(f"{summary['tests']} tests, {summary['counts']}, {'running' if summary['running'] else 'finished'}: {html_path}")
+        if not args.watch or not summary['running']:
+            break
+        time.sleep(args.watch)
+    for nodeid, phase, message in summary['failed']:
+        print(f"FAILED {nodeid} ({phase}): {message}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,53 @@
+import json
+import os
+import time
+
+RESULTS_DIR = os.path.join('reports', 'results')
+# fsync after every test line so a crashed machine keeps everything up to the last finished test
+RESULTS_FSYNC = os.environ.get('NEODOVE_RESULTS_FSYNC', '1') == '1'
+
+
+def run_id():
+    # Shared by the main process and the xdist workers, which inherit the environment.
+    # The pid keeps two runs started in the same second apart.
+    if 'NEODOVE_RUN_ID' not in os.environ:
+        os.environ['NEODOVE_RUN_ID'] = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+    return os.environ['NEODOVE_RUN_ID']
+
+
+def results_path(run=None):
+    return os.path.join(RESULTS_DIR, f"{run or run_id()}.jsonl")
+
+
+class ResultSink:
+    # One JSON line per event, appended as soon as it happens. Every line is a single
+    # O_APPEND write, so workers can share the file without interleaving lines.
+    def __init__(self, path=None, worker='main'):
+        self.path = path or results_path()
+        self.worker = worker
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def write(self, event, sync=False, **fields):
+        record = {'event': event, 'worker': self.worker, 'time': round(time.time(), 3), **fields}
+        os.write(self._fd, (json.dumps(record) + '\n').encode())
+        if sync and RESULTS_FSYNC:
+            os.fsync(self._fd)
+
+    def step(self, nodeid, step):
+        self.write('step', nodeid=nodeid, **step)
+
+    def test(self, nodeid, phase_reports, properties):
+        failed = next((r for r in phase_reports.values() if r.failed), None)
+        skipped = next((r for r in phase_reports.values() if r.skipped), None)
+        outcome = 'failed' if failed else 'skipped' if skipped else 'passed'
+        call = phase_reports.get('call')
+        self.write('test', sync=True, nodeid=nodeid, outcome=outcome,
+                   failed_in=failed.when if failed else None,
+                   duration_ms=round(sum(r.duration for r in phase_reports.values()) * 1000, 1),
+                   call_ms=round(call.duration * 1000, 1) if call else None,
+                   message=(failed.longreprtext.strip().splitlines() or [''])[-1][:500] if failed else None,
+                   properties=properties)
+
+    def close(self):
+        os.close(self._fd)
@@ -0,0 +1,33 @@
+from constants import BASE_URL
+
+
+def _route(name, menu, item, path):
+    return {'name': name, 'menu': menu, 'item': item, 'url': f"{BASE_URL}{path}"}
+
+
+# Every sidebar destination: the menu it sits in and the item clicked (selectors in pages.py), and the URL it lands on
+NAV_ROUTES = [
+    _route('contacts', None, 'Contacts', "/contacts"),
+    _route('pipeline-sales', 'Pipeline', 'Sales', "/campaign/65aac1b7b7eab91b44e038ff"),
+    _route('pipeline-service', 'Pipeline', 'Service', "/campaign/65aac1b7b7eab91b44e03900"),
+    _route('pipeline-reminder', 'Pipeline', 'Reminder', "/campaign/65aac1b7b7eab91b44e03901"),
+    _route('pipeline-feedback', 'Pipeline', 'Feedback', "/campaign/65aac1b7b7eab91b44e03902"),
+    _route('pipeline-other', 'Pipeline', 'Other', "/campaign/65aac1b7b7eab91b44e03903"),
+    _route('pipeline-testing', 'Pipeline', 'Testing Pipeline', "/campaign/65dc5b3ae3c28206f4c2dd1b"),
+    _route('pipeline-coko-noko', 'Pipeline', 'COKO NOKO', "/campaign/65e5c05c5bb80697ca43b2c6"),
+    _route('pipeline-new', 'Pipeline', 'New Pipeline', "/campaign/66348838f22612dcb0b6651c"),
+    _route('pipeline-view-all', 'Pipeline', 'View all', "/campaign/all"),
+    _route('integrations', None, 'Integrations', "/integration"),
+    _route('trends-business', 'Trends', 'Business Trend', "/trends/business"),
+    _route('trends-users', 'Trends', 'Users Trend', "/trends/user"),
+    _route('reports-call', 'Reports > User', 'Call Report', "/reports/user-report"),
+    _route('reports-login', 'Reports > User', 'Login Report', "/reports/login-report"),
+    _route('reports-follow-up', 'Reports > User', 'Follow-up Report', "/reports/follow-up"),
+    _route('reports-campaign', 'Reports > Campaign', 'Campaign Report', "/reports/campaign-report"),
+    _route('reports-campaign-lead', 'Reports > Campaign', 'Campaign Lead Report', "/reports/campaign-lead-report"),
+    _route('reports-download-logs', 'Reports', 'Download Logs', "/reports/download-async-report"),
+    _route('marketplace', None, 'Marketplace', "/marketplace"),
+    _route('sms-automation', None, 'SMS Automation', "/sms-automation"),
+    _route('workflow', None, 'Workflow', "/workflow"),
+    _route('settings', None, 'Settings', "/settings/user"),
+]
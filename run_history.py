@@ -0,0 +1,61 @@
+import json
+import os
+import time
+
+HISTORY_FILE = '.run_history.json'
+
+# Weight of the newest duration in the running average
+DURATION_SMOOTHING = 0.5
+
+
+def load_history(path=HISTORY_FILE):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except ValueError:
+        print(f"Ignoring unreadable run history at {path}")
+        return {}
+
+
+def save_history(history, path=HISTORY_FILE):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(history, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def record_duration(history, nodeid, duration):
+    entry = history.setdefault(nodeid, {})
+    previous = entry.get('duration')
+    if previous is None:
+        entry['duration'] = duration
+    else:
+        entry['duration'] = DURATION_SMOOTHING * duration + (1 - DURATION_SMOOTHING) * previous
+    return entry
+
+
+def record_result(history, nodeid, outcome, input_hash=None):
+    entry = history.setdefault(nodeid, {})
+    entry['outcome'] = outcome
+    if outcome == 'failed':
+        entry['last_failed'] = time.time()
+    if input_hash is not None:
+        entry['input_hash'] = input_hash
+    return entry
+
+
+def balance_shards(nodeids, history, workers):
+    # Longest-processing-time first: hand the slowest remaining test to the least loaded worker
+    known = [history[n]['duration'] for n in nodeids if 'duration' in history.get(n, {})]
+    default = sorted(known)[len(known) // 2] if known else 1.0
+    durations = {n: history.get(n, {}).get('duration', default) for n in nodeids}
+
+    loads = [0.0] * workers
+    shards = {}
+    for nodeid in sorted(nodeids, key=lambda n: durations[n], reverse=True):
+        worker = loads.index(min(loads))
+        loads[worker] += durations[nodeid]
+        shards[nodeid] = worker
+    return shards, loads
@@ -1,9 +1,44 @@
+import argparse
 import os
 import pytest
 
+parser = argparse.ArgumentParser(description="Run the Neodove web automation suite")
+parser.add_argument('-w', '--workers', type=int, default=int(os.environ.get('NEODOVE_WORKERS', 1)),
+                    help="Number of worker processes, each with its own browser and session")
+parser.add_argument('--profile', choices=['headful-debug', 'headless-fast', 'headless-minimal'],
+                    help="Browser launch profile, see LAUNCH_PROFILES in constants.py")
+parser.add_argument('--throttle', choices=['none', 'fast-3g', 'slow-3g', 'cpu-4x', 'mobile'],
+                    help="Network/CPU throttling for every test, see THROTTLE_PROFILES in throttling.py")
+parser.add_argument('--stand-in', action='store_true',
+                    help="Run against the bundled local stand-in server instead of connect.neodove.com")
+parser.add_argument('--stand-in-port', type=int, default=8765)
+parser.add_argument('--stand-in-config', help="Latency config for the stand-in, see stand_in_server.py")
+args, pytest_args = parser.parse_known_args()
+
 # Create the reports directory if it doesn't exist
 if not os.path.exists('reports'):
     os.makedirs('reports')
 
+if args.profile:
+    os.environ['NEODOVE_LAUNCH_PROFILE'] = args.profile
+
+if args.throttle:
+    os.environ['NEODOVE_THROTTLE'] = args.throttle
+
+if args.stand_in:
+    # Set before anything imports constants, workers inherit it too
+    os.environ['NEODOVE_BASE_URL'] = f"http://127.0.0.1:{args.stand_in_port}"
+    # The stand-in implements the auth endpoints, see LOGIN_MODE in constants.py
+    os.environ.setdefault('NEODOVE_LOGIN_MODE', 'api')
+    from stand_in_server import LatencyProfile, start_stand_in
+    latency = LatencyProfile.from_file(args.stand_in_config) if args.stand_in_config else None
+    stand_in = start_stand_in(port=args.stand_in_port, latency=latency)
+    print(f"Running against the stand-in at {stand_in.base_url}")
+
+# Split the tests across workers, balanced on past durations (see conftest.py).
+# pytest-html merges the worker results into reports/report.html.
+if args.workers > 1:
+    pytest_args = ['-n', str(args.workers), '--dist', 'loadgroup'] + pytest_args
+
 # Run pytest with the configuration from pytest.ini
-pytest.main()
+pytest.main(pytest_args)
@@ -0,0 +1,42 @@
+import time
+
+# Quick tests that tell us whether the app is usable at all, they run before the long flows
+HIGH_SIGNAL_TESTS = (
+    'test_login_page_elements', 'test_login', 'test_invalid_login_invalid_password',
+    'test_invalid_login_invalid_username', 'test_dashboard',
+)
+
+# Failures of these mean the rest of the run will fail too, see --fail-fast-after
+CORE_TESTS = ('test_login', 'test_login_page_elements', 'test_dashboard')
+
+# A failure older than this no longer moves a test to the front
+RECENT_FAILURE_SECONDS = 7 * 24 * 3600
+
+
+def test_name(nodeid):
+    return nodeid.split('::')[-1].split('[')[0]
+
+
+def is_core(nodeid):
+    return test_name(nodeid) in CORE_TESTS
+
+
+def order_items(items, history, now=None):
+    # Recently failed first (newest failure first), then high-signal tests, then everything else,
+    # fastest first within each band. Python's sort is stable, so ties keep file order.
+    now = now or time.time()
+    known = sorted(entry['duration'] for entry in history.values() if 'duration' in entry)
+    default_duration = known[len(known) // 2] if known else 1.0
+
+    def priority(item):
+        entry = history.get(item.nodeid, {})
+        last_failed = entry.get('last_failed', 0)
+        duration = entry.get('duration', default_duration)
+        if entry.get('outcome') == 'failed' and now - last_failed < RECENT_FAILURE_SECONDS:
+            return (0, -last_failed, duration)
+        if test_name(item.nodeid) in HIGH_SIGNAL_TESTS:
+            return (1, 0, duration)
+        return (2, 0, duration)
+
+    items.sort(key=priority)
+    return items
@@ -0,0 +1,118 @@
+import ast
+import glob
+import hashlib
+import inspect
+import json
+import os
+
+import pages
+from pages import LOGIN_SELECTORS, SIDEBAR_MENUS, SIDEBAR_ITEMS, SIDEBAR_SELECTORS
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Config files tests read, hashed with the helper modules
+HELPER_CONFIGS = ('budgets.json',)
+
+_helper_digest = None
+
+
+def _local_imports(path):
+    # Modules of this directory a module imports, including imports deferred into functions
+    with open(path, 'rb') as f:
+        tree = ast.parse(f.read(), filename=path)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split('.')[0])
+    return [os.path.join(HERE, name + '.py') for name in sorted(names)
+            if os.path.exists(os.path.join(HERE, name + '.py'))]
+
+
+def helper_modules():
+    # Modules the suite imports at runtime, found from conftest.py and the test modules.
+    # Scripts nothing imports (benchmark, load test, reports) never change a test's result.
+    # pages.py and routes.py are left out: page object code is hashed below, and the
+    # selector and route tables per test.
+    pending = [os.path.join(HERE, 'conftest.py')] + sorted(glob.glob(os.path.join(HERE, 'test_*.py')))
+    seen = set()
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        pending.extend(_local_imports(path))
+    return sorted(path for path in seen
+                  if not os.path.basename(path).startswith('test_')
+                  and os.path.basename(path) not in ('pages.py', 'routes.py'))
+
+
+def helper_digest():
+    global _helper_digest
+    if _helper_digest is None:
+        digest = hashlib.sha256()
+        for path in helper_modules() + [os.path.join(HERE, name) for name in HELPER_CONFIGS]:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        # Login and sidebar header selectors every test goes through
+        digest.update(json.dumps([LOGIN_SELECTORS, SIDEBAR_SELECTORS], sort_keys=True).encode())
+        # Page object code including the PageObject base class, but not the menu and item tables
+        for _, member in inspect.getmembers(pages, lambda m: inspect.isclass(m) or inspect.isfunction(m)):
+            if member.__module__ == pages.__name__:
+                digest.update(inspect.getsource(member).encode())
+        _helper_digest = digest.hexdigest()
+    return _helper_digest
+
+
+def _fixture_sources(item):
+    # Fixtures defined next to the tests, e.g. page_handle or stand_in; pytest's own are skipped
+    sources = {}
+    for name, fixturedefs in sorted(item._fixtureinfo.name2fixturedefs.items()):
+        for fixturedef in fixturedefs:
+            try:
+                path = inspect.getsourcefile(fixturedef.func)
+            except TypeError:
+                continue
+            if path and os.path.dirname(os.path.abspath(path)) == HERE:
+                sources.setdefault(name, []).append(inspect.getsource(fixturedef.func))
+    return sources
+
+
+def _route_inputs(route):
+    selectors = [SIDEBAR_ITEMS[route['item']]]
+    menu = route['menu']
+    while menu:
+        selectors.append(SIDEBAR_MENUS[menu]['toggle'])
+        selectors.append(SIDEBAR_MENUS[menu]['probe'])
+        menu = SIDEBAR_MENUS[menu]['parent']
+    return {'route': route, 'selectors': selectors}
+
+
+def inputs_of(item):
+    # Everything that decides what a test does: its code and fixtures, its parameters with
+    # their selectors and expected URLs, and the helper code it runs through
+    params = {}
+    callspec = getattr(item, 'callspec', None)
+    for name, value in sorted(callspec.params.items() if callspec else []):
+        if isinstance(value, dict) and 'item' in value and 'menu' in value:
+            params[name] = _route_inputs(value)
+        else:
+            params[name] = repr(value)
+    return {
+        'source': inspect.getsource(item.function),
+        'fixtures': _fixture_sources(item),
+        'params': params,
+        'helpers': helper_digest(),
+    }
+
+
+def input_hash(item):
+    encoded = json.dumps(inputs_of(item), sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def needs_run(history_entry, current_hash):
+    if not history_entry:
+        return True
+    return history_entry.get('input_hash') != current_hash or history_entry.get('outcome') != 'passed'
@@ -0,0 +1,49 @@
+import os
+import time
+
+from constants import LOGIN_URL, HOME_URL, LOGIN_MODE, SESSION_FILE, SESSION_TTL, api_login, login, new_context
+from har import HAR_MODE
+from quiescence import wait_for_quiet
+
+
+def session_is_fresh(path=SESSION_FILE, ttl=SESSION_TTL):
+    if not os.path.exists(path):
+        return False
+    return time.time() - os.path.getmtime(path) < ttl
+
+
+def save_session(context, path=SESSION_FILE):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    context.storage_state(path=path)
+
+
+def clear_session(path=SESSION_FILE):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def is_logged_in(page):
+    # The app redirects to the login page once the session has expired
+    page.goto(HOME_URL)
+    wait_for_quiet(page)
+    return not page.url.startswith(LOGIN_URL)
+
+
+def authenticated_context(browser, path=SESSION_FILE, ttl=SESSION_TTL, har_name=None, login_mode=LOGIN_MODE):
+    if session_is_fresh(path, ttl):
+        context = new_context(browser, har_name=har_name, storage_state=path)
+        page = context.new_page()
+        if is_logged_in(page):
+            return context, page
+        print("Cached session has expired, logging in again.")
+        context.close()
+        clear_session(path)
+
+    context = new_context(browser, har_name=har_name)
+    # API requests bypass route_from_har, archives are recorded and replayed with the login form
+    token = api_login(context) if login_mode == 'api' and HAR_MODE == 'off' else None
+    page = context.new_page()
+    if not (token and is_logged_in(page)):
+        login(page)
+    save_session(context, path)
+    return context, page
@@ -0,0 +1,296 @@
+import argparse
+import json
+import random
+import secrets
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from constants import login_credentials
+
+SESSION_COOKIE = 'nd_session'
+
+NOT_VERIFIED_MESSAGE = "You are not verified. Please contact your NeoDove account manager!"
+WRONG_PASSWORD_MESSAGE = "Please enter correct password!"
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>NeoDove</title></head>
+<body>
+<form id="login-form">
+  <div class="title">Log in</div>
+  <input name="username" placeholder="Email/Phone Number">
+  <input name="password" type="password" placeholder="Password">
+  <label class="mat-checkbox-layout">
+    <span class="mat-checkbox-inner-container"><input type="checkbox" id="mat-checkbox-1-input"></span>
+    <span>I agree to the terms</span>
+  </label>
+  <button type="submit" disabled>Log in</button>
+  <div id="error"></div>
+</form>
+<div id="confirm-dialog" hidden>
+  <h2>Confirm Login</h2>
+  <p>You are logged in on another device.</p>
+  <button type="button" id="continue">Continue</button>
+</div>
+<script>
+const form = document.getElementById('login-form');
+const submit = form.querySelector('button[type=submit]');
+let token = null;
+document.getElementById('mat-checkbox-1-input').addEventListener('change', (e) => {
+  submit.disabled = !e.target.checked;
+});
+form.addEventListener('submit', async (e) => {
+  e.preventDefault();
+  const response = await fetch('/api/login', {method: 'POST', headers: {'Content-Type': 'application/json'},
+    body: JSON.stringify({username: form.username.value, password: form.password.value})});
+  const body = await response.json();
+  if (!response.ok) {
+    document.getElementById('error').innerHTML = '<span class="error"></span>';
+    document.querySelector('#error span').textContent = body.message;
+    return;
+  }
+  token = body.token;
+  document.getElementById('confirm-dialog').hidden = false;
+});
+document.getElementById('continue').addEventListener('click', async () => {
+  await fetch('/api/login/confirm', {method: 'POST', headers: {'Content-Type': 'application/json'},
+    body: JSON.stringify({token})});
+  location.href = '/home';
+});
+</script>
+</body></html>
+"""
+
+SHELL_PAGE = """<!DOCTYPE html>
+<html><head><title>NeoDove</title></head>
+<body>
+<nav class="sidebar">
+  <span class="nd-logo-text">Stalin Test</span>
+  <a href="/home" title="Dashboard"><span class="mat-button-wrapper pl-7 ng-trigger ng-trigger-animateText">Dashboard</span></a>
+  <a href="/contacts" title="Contacts"><span class="mat-button-wrapper">Contacts</span></a>
+  <div class="menu">
+    <a data-toggle="pipeline"><span class="mat-button-wrapper pl-7 mb-2 ng-trigger ng-trigger-animateText">Pipeline</span></a>
+    <div class="submenu" id="pipeline" hidden>
+      <a href="/campaign/65aac1b7b7eab91b44e038ff"><span class="mat-ripple mat-list-item-ripple"></span><span class="mat-button-wrapper pl-7">Sales</span></a>
+      <a href="/campaign/65aac1b7b7eab91b44e03900"><span class="mat-ripple mat-list-item-ripple"></span><span class="mat-button-wrapper pl-7">Service</span></a>
+      <a href="/campaign/65aac1b7b7eab91b44e03901"><span class="mat-ripple mat-list-item-ripple"></span><span class="mat-button-wrapper pl-7">Reminder</span></a>
+      <a href="/campaign/65aac1b7b7eab91b44e03902"><span class="mat-ripple mat-list-item-ripple"></span><span class="mat-button-wrapper pl-7">Feedback</span></a>
+      <a href="/campaign/65aac1b7b7eab91b44e03903"><span class="mat-ripple mat-list-item-ripple"></span><span class="mat-button-wrapper pl-7">Other</span></a>
+      <a href="/campaign/65dc5b3ae3c28206f4c2dd1b"><span class="mat-ripple mat-list-item-ripple"></span><span class="mat-button-wrapper pl-7">Testing Pipeline</span></a>
+      <a href="/campaign/65e5c05c5bb80697ca43b2c6"><span class="mat-ripple mat-list-item-ripple"></span><span class="mat-button-wrapper pl-7">COKO NOKO</span></a>
+      <a href="/campaign/66348838f22612dcb0b6651c"><span class="mat-ripple mat-list-item-ripple"></span><span class="mat-button-wrapper pl-7">New Pipeline</span></a>
+      <a href="/campaign/all"><b>View all</b></a>
+    </div>
+  </div>
+  <a href="/integration" title="Integrations"><span class="mat-button-wrapper">Integrations</span></a>
+  <div class="menu">
+    <a data-toggle="trends"><span class="mat-button-wrapper pl-7 mb-2 ng-trigger ng-trigger-animateText">Trends</span></a>
+    <div class="submenu" id="trends" hidden>
+      <a href="/trends/business"><span class="mat-button-wrapper pl-7">Business Trend</span></a>
+      <a href="/trends/user"><span class="mat-button-wrapper pl-7">Users Trend</span></a>
+    </div>
+  </div>
+  <div class="menu">
+    <a data-toggle="reports"><span class="mat-button-wrapper pl-7 mb-2">Reports</span></a>
+    <div class="submenu" id="reports" hidden>
+      <a id="nd-user-report" data-toggle="reports-user"><span class="mat-button-wrapper pl-7 mb-2">User</span></a>
+      <div class="submenu" id="reports-user" hidden>
+        <a href="/reports/user-report"><span class="mat-button-wrapper pl-7">Call Report</span></a>
+        <a href="/reports/login-report"><span class="mat-button-wrapper pl-7">Login Report</span></a>
+        <a href="/reports/follow-up"><span class="mat-button-wrapper pl-7">Follow-up Report</span></a>
+      </div>
+      <a data-toggle="reports-campaign"><span class="mat-button-wrapper pl-5">Campaign</span></a>
+      <div class="submenu" id="reports-campaign" hidden>
+        <a href="/reports/campaign-report"><span class="mat-button-wrapper pl-7">Campaign Report</span></a>
+        <a href="/reports/campaign-lead-report"><span class="mat-button-wrapper pl-7">Campaign Lead Report</span></a>
+      </div>
+      <a href="/reports/download-async-report"><span class="mat-button-wrapper pl-5">Download Logs</span></a>
+    </div>
+  </div>
+  <a href="/marketplace" title="Marketplace"><span class="mat-button-wrapper">Marketplace</span></a>
+  <a href="/sms-automation" title="SMS Automation"><span class="mat-button-wrapper">SMS Automation</span></a>
+  <a href="/workflow" routerlink="/workflow"><span class="mat-button-wrapper">Workflow</span></a>
+  <a href="/settings/user" title="Settings"><span class="mat-button-wrapper">Settings</span></a>
+</nav>
+<main><h1>{path}</h1></main>
+<script>
+document.addEventListener('click', (e) => {
+  const toggle = e.target.closest('[data-toggle]');
+  if (toggle) {
+    const submenu = document.getElementById(toggle.dataset.toggle);
+    submenu.hidden = !submenu.hidden;
+  }
+});
+</script>
+</body></html>
+"""
+
+# Pages behind the login, every sidebar destination renders the shell
+APP_PATHS = {
+    '/home', '/contacts', '/integration', '/marketplace', '/sms-automation', '/workflow', '/settings/user',
+    '/campaign/all', '/campaign/65aac1b7b7eab91b44e038ff', '/campaign/65aac1b7b7eab91b44e03900',
+    '/campaign/65aac1b7b7eab91b44e03901', '/campaign/65aac1b7b7eab91b44e03902', '/campaign/65aac1b7b7eab91b44e03903',
+    '/campaign/65dc5b3ae3c28206f4c2dd1b', '/campaign/65e5c05c5bb80697ca43b2c6', '/campaign/66348838f22612dcb0b6651c',
+    '/trends/business', '/trends/user', '/reports/user-report', '/reports/login-report', '/reports/follow-up',
+    '/reports/campaign-report', '/reports/campaign-lead-report', '/reports/download-async-report',
+}
+
+
+class LatencyProfile:
+    # latency_ms/jitter_ms apply to every request, routes overrides them by path prefix
+    def __init__(self, latency_ms=0, jitter_ms=0, routes=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.routes = routes or {}
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as f:
+            config = json.load(f)
+        return cls(config.get('latency_ms', 0), config.get('jitter_ms', 0), config.get('routes'))
+
+    def delay_for(self, path):
+        latency, jitter = self.latency_ms, self.jitter_ms
+        matches = [prefix for prefix in self.routes if path.startswith(prefix)]
+        if matches:
+            route = self.routes[max(matches, key=len)]
+            latency = route.get('latency_ms', latency)
+            jitter = route.get('jitter_ms', jitter)
+        return max(0, latency + random.uniform(-jitter, jitter)) / 1000
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server_version = 'NeoDoveStandIn/1.0'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        time.sleep(self.server.latency.delay_for(path))
+        if path in ('/', '/login'):
+            self._send_html(LOGIN_PAGE)
+        elif path in APP_PATHS:
+            if self._session() is None:
+                self._redirect('/login')
+            else:
+                self._send_html(SHELL_PAGE.replace('{path}', path))
+        else:
+            self._send_json(404, {'message': 'Not found'})
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        time.sleep(self.server.latency.delay_for(path))
+        body = self._read_json()
+        if path == '/api/login':
+            self._login(body)
+        elif path == '/api/login/confirm':
+            self._confirm_login(body)
+        else:
+            self._send_json(404, {'message': 'Not found'})
+
+    def _login(self, body):
+        credentials = self.server.credentials
+        if body.get('username') != credentials['username']:
+            self._send_json(401, {'message': NOT_VERIFIED_MESSAGE})
+        elif body.get('password') != credentials['password']:
+            self._send_json(401, {'message': WRONG_PASSWORD_MESSAGE})
+        else:
+            token = secrets.token_hex(16)
+            self.server.pending_tokens.add(token)
+            self._send_json(200, {'token': token, 'confirm': True})
+
+    def _confirm_login(self, body):
+        token = body.get('token')
+        if token not in self.server.pending_tokens:
+            self._send_json(401, {'message': 'Login has expired, please log in again'})
+            return
+        self.server.pending_tokens.discard(token)
+        self.server.sessions.add(token)
+        self._send_json(200, {'token': token}, cookie=token)
+
+    def _session(self):
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        if SESSION_COOKIE in cookie and cookie[SESSION_COOKIE].value in self.server.sessions:
+            return cookie[SESSION_COOKIE].value
+        return None
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            return json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            return {}
+
+    def _send_html(self, html):
+        self._send(200, 'text/html; charset=utf-8', html.encode())
+
+    def _send_json(self, status, payload, cookie=None):
+        headers = {}
+        if cookie:
+            headers['Set-Cookie'] = f"{SESSION_COOKIE}={cookie}; Path=/; HttpOnly; SameSite=Lax"
+        self._send(status, 'application/json', json.dumps(payload).encode(), headers)
+
+    def _redirect(self, location):
+        self._send(302, 'text/plain', b'', {'Location': location})
+
+    def _send(self, status, content_type, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, latency=None, credentials=None, verbose=False):
+        super().__init__((host, port), StandInHandler)
+        self.latency = latency or LatencyProfile()
+        self.credentials = credentials or login_credentials
+        self.verbose = verbose
+        self.pending_tokens = set()
+        self.sessions = set()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_stand_in(host='127.0.0.1', port=0, latency=None, credentials=None, verbose=False):
+    server = StandInServer(host, port, latency, credentials, verbose)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local NeoDove stand-in for offline runs and benchmarking")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0, help="Latency added to every request, in ms")
+    parser.add_argument('--jitter', type=float, default=0, help="Random +/- jitter on the latency, in ms")
+    parser.add_argument('--latency-config', help="JSON file with latency_ms, jitter_ms and per-path routes")
+    parser.add_argument('--verbose', action='store_true')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.latency_config:
+        latency = LatencyProfile.from_file(args.latency_config)
+    else:
+        latency = LatencyProfile(args.latency, args.jitter)
+    server = StandInServer(args.host, args.port, latency, verbose=args.verbose)
+    print(f"NeoDove stand-in listening on {server.base_url}, run the suite with NEODOVE_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,92 @@
+import functools
+import html
+import json
+import os
+import time
+from contextlib import contextmanager
+
+STEPS_FILE = os.environ.get('NEODOVE_STEPS_FILE', os.path.join('reports', 'steps.json'))
+
+# Page methods timed automatically, with the argument used as the step label
+TIMED_METHODS = ('goto', 'click', 'wait_for_selector', 'wait_for_load_state')
+
+
+class StepRecorder:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.steps = []
+        self.listeners = []
+        self._depth = 0
+
+    @contextmanager
+    def step(self, label, kind='step'):
+        start = time.monotonic()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            record = {
+                'label': label,
+                'kind': kind,
+                'depth': self._depth,
+                'start_ms': round((start - self.started) * 1000, 1),
+                'duration_ms': round((time.monotonic() - start) * 1000, 1),
+            }
+            self.steps.append(record)
+            for listener in self.listeners:
+                listener(record)
+
+
+# Recorder of the running test, set by the autouse fixture in conftest.py
+current = None
+
+
+@contextmanager
+def step(label):
+    if current is None:
+        yield
+        return
+    with current.step(label):
+        yield
+
+
+def _timed(method, kind):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if current is None:
+            return method(*args, **kwargs)
+        target = args[0] if args else next(iter(kwargs.values()), '')
+        with current.step(f"{kind} {target}", kind=kind):
+            return method(*args, **kwargs)
+    return wrapper
+
+
+def instrument_page(page):
+    if getattr(page, '_step_timing', False):
+        return page
+    for name in TIMED_METHODS:
+        setattr(page, name, _timed(getattr(page, name), name))
+    page._step_timing = True
+    return page
+
+
+def waterfall_html(steps):
+    total = max((s['start_ms'] + s['duration_ms'] for s in steps), default=0) or 1
+    rows = []
+    for s in sorted(steps, key=lambda s: (s['start_ms'], s['depth'])):
+        left = s['start_ms'] / total * 100
+        width = max(s['duration_ms'] / total * 100, 0.2)
+        rows.append(
+            f'<tr><td style="padding-left:{s["depth"] * 12}px">{html.escape(s["label"])}</td>'
+            f'<td style="text-align:right">{s["duration_ms"]:.0f} ms</td>'
+            f'<td style="width:60%"><div style="margin-left:{left:.2f}%;width:{width:.2f}%;'
+            f'height:10px;background:#4a90d9"></div></td></tr>')
+    return ('<table class="steps-waterfall" style="width:100%;font-size:12px">'
+            '<tr><th>Step</th><th>Duration</th><th>Timeline</th></tr>' + ''.join(rows) + '</table>')
+
+
+def write_steps(results, path=STEPS_FILE):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
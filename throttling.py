@@ -0,0 +1,84 @@
+import os
+from contextlib import contextmanager
+
+# Network and CPU conditions applied through CDP, with the factor timeouts are scaled by.
+# The network numbers are the Chrome DevTools presets: throughput in bytes/s, latency in ms.
+THROTTLE_PROFILES = {
+    'none': {'timeout_factor': 1},
+    'fast-3g': {
+        'network': {'latency': 562.5, 'downloadThroughput': 180 * 1024, 'uploadThroughput': 84 * 1024},
+        'timeout_factor': 2,
+    },
+    'slow-3g': {
+        'network': {'latency': 2000, 'downloadThroughput': 50 * 1024, 'uploadThroughput': 50 * 1024},
+        'timeout_factor': 5,
+    },
+    'cpu-4x': {'cpu_rate': 4, 'timeout_factor': 2},
+    'mobile': {
+        'network': {'latency': 562.5, 'downloadThroughput': 180 * 1024, 'uploadThroughput': 84 * 1024},
+        'cpu_rate': 4,
+        'timeout_factor': 3,
+    },
+}
+# Profile for the whole run, a test picks its own with @pytest.mark.throttle('slow-3g')
+THROTTLE_PROFILE = os.environ.get('NEODOVE_THROTTLE', 'none')
+DEFAULT_TIMEOUT = 30000
+
+UNTHROTTLED = {'offline': False, 'latency': 0, 'downloadThroughput': -1, 'uploadThroughput': -1}
+
+
+def profile_for(node):
+    marker = node.get_closest_marker('throttle')
+    return marker.args[0] if marker else THROTTLE_PROFILE
+
+
+def scaled(page, timeout):
+    # Timeouts handed to Playwright grow with the throttling applied to the page's context
+    return timeout * getattr(page.context, '_timeout_factor', 1)
+
+
+def _throttle_page(page, profile):
+    # Emulation only lasts as long as the CDP session that set it, so the session stays on the page
+    session = getattr(page, '_throttle_session', None)
+    if session is None:
+        session = page.context.new_cdp_session(page)
+        session.send('Network.enable')
+        page._throttle_session = session
+    session.send('Network.emulateNetworkConditions', dict(UNTHROTTLED, **profile.get('network', {})))
+    session.send('Emulation.setCPUThrottlingRate', {'rate': profile.get('cpu_rate', 1)})
+
+
+def apply_throttling(context, name):
+    profile = THROTTLE_PROFILES[name]
+    previous = getattr(context, '_throttle_listener', None)
+    if previous:
+        context.remove_listener('page', previous)
+        context._throttle_listener = None
+    for page in context.pages:
+        _throttle_page(page, profile)
+    if name != 'none':
+        context._throttle_listener = lambda page: _throttle_page(page, profile)
+        context.on('page', context._throttle_listener)
+    context._throttle = name
+    context._timeout_factor = profile['timeout_factor']
+    context.set_default_timeout(DEFAULT_TIMEOUT * profile['timeout_factor'])
+    context.set_default_navigation_timeout(DEFAULT_TIMEOUT * profile['timeout_factor'])
+
+
+def throttle_of(page):
+    return getattr(page.context, '_throttle', 'none')
+
+
+@contextmanager
+def throttled(page, node):
+    # Applies the test's throttling profile and lifts it afterwards, pooled contexts outlive the test
+    name = profile_for(node)
+    if name == 'none' and throttle_of(page) == 'none':
+        yield
+        return
+    apply_throttling(page.context, name)
+    try:
+        yield
+    finally:
+        if not page.is_closed():
+            apply_throttling(page.context, 'none')
@@ -0,0 +1,69 @@
+import time
+
+from throttling import scaled
+
+# Fixed sleeps replaced by condition waits during this run, see sleep_savings()
+sleep_stats = {'calls': 0, 'replaced_ms': 0, 'waited_ms': 0}
+
+ANGULAR_STABLE_JS = """() => {
+    if (document.readyState !== 'complete') return false;
+    if (!window.getAllAngularTestabilities) return true;
+    return window.getAllAngularTestabilities().every(t => t.isStable());
+}"""
+
+ANIMATION_DONE_JS = """(el) => {
+    if (!el.isConnected) return true;
+    const busy = el.closest('.ng-animating') || el.querySelector('.ng-animating');
+    return !busy && el.getAnimations({subtree: true}).length === 0;
+}"""
+
+
+def _record(started, replaces):
+    # Only waits standing in for a fixed sleep count towards the savings
+    waited_ms = (time.monotonic() - started) * 1000
+    if not replaces:
+        return waited_ms
+    sleep_stats['calls'] += 1
+    sleep_stats['replaced_ms'] += replaces
+    sleep_stats['waited_ms'] += waited_ms
+    return waited_ms
+
+
+def _app_stable(page, timeout):
+    page.wait_for_function(ANGULAR_STABLE_JS, timeout=scaled(page, timeout))
+
+
+def _animation_done(page, selector, timeout):
+    element = page.wait_for_selector(selector, state='visible', timeout=scaled(page, timeout))
+    page.wait_for_function(ANIMATION_DONE_JS, arg=element, timeout=scaled(page, timeout))
+
+
+def wait_for_app_stable(page, timeout=20000, replaces=0):
+    started = time.monotonic()
+    _app_stable(page, timeout)
+    return _record(started, replaces)
+
+
+def wait_for_route(page, url, timeout=20000, replaces=0):
+    started = time.monotonic()
+    page.wait_for_url(url, timeout=scaled(page, timeout))
+    _app_stable(page, timeout)
+    return _record(started, replaces)
+
+
+def wait_for_animation_end(page, selector, timeout=20000, replaces=0):
+    started = time.monotonic()
+    _animation_done(page, selector, timeout)
+    return _record(started, replaces)
+
+
+def wait_for_menu_expanded(page, item_selector, timeout=20000, replaces=0):
+    # A sub-menu is expanded once its item is visible and has stopped sliding in
+    started = time.monotonic()
+    _animation_done(page, item_selector, timeout)
+    _app_stable(page, timeout)
+    return _record(started, replaces)
+
+
+def sleep_savings():
+    return sleep_stats['replaced_ms'] - sleep_stats['waited_ms']
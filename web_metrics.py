@@ -0,0 +1,151 @@
+import functools
+import json
+import os
+import time
+import warnings
+from contextlib import contextmanager
+
+from playwright.sync_api import Error as PlaywrightError
+
+from throttling import THROTTLE_PROFILES, throttle_of
+
+METRICS_FILE = os.environ.get('NEODOVE_METRICS_FILE', os.path.join('reports', 'web_metrics.jsonl'))
+BUDGETS_FILE = os.environ.get('NEODOVE_BUDGETS_FILE', 'budgets.json')
+# 'warn' or 'fail' when a route goes over budget, overrides the mode in the budgets file
+BUDGET_MODE = os.environ.get('NEODOVE_BUDGET_MODE')
+
+ROUTE_MARK = 'nd-route-start'
+
+# Installed on every context: keeps the latest LCP candidate and room for more than 250 resource entries
+OBSERVER_JS = """
+performance.setResourceTimingBufferSize(2000);
+try {
+    new PerformanceObserver((list) => {
+        const entries = list.getEntries();
+        window.__ndLcp = entries[entries.length - 1].startTime;
+    }).observe({type: 'largest-contentful-paint', buffered: true});
+} catch (e) {}
+"""
+
+# Metrics since the route mark. A soft (in-app) navigation keeps the mark and has no new
+# Navigation Timing or paint entries; a full page load drops the mark and counts from time origin.
+METRICS_JS = """(mark) => {
+    const marks = performance.getEntriesByName(mark);
+    const soft = marks.length > 0;
+    const since = soft ? marks[marks.length - 1].startTime : 0;
+    const nav = soft ? null : performance.getEntriesByType('navigation')[0];
+    const resources = performance.getEntriesByType('resource').filter(r => r.startTime >= since);
+    const paint = Object.fromEntries(performance.getEntriesByType('paint').map(p => [p.name, p.startTime]));
+    return {
+        soft_navigation: soft,
+        ttfb_ms: nav ? nav.responseStart - nav.requestStart : null,
+        dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd : null,
+        load_ms: nav ? nav.loadEventEnd : null,
+        fcp_ms: soft ? null : (paint['first-contentful-paint'] ?? null),
+        lcp_ms: soft ? null : (window.__ndLcp ?? null),
+        requests: resources.length + (nav ? 1 : 0),
+        transfer_bytes: resources.reduce((sum, r) => sum + (r.transferSize || 0), 0) + (nav ? nav.transferSize : 0),
+    };
+}"""
+
+# Chromium counters read through CDP Performance.getMetrics
+CDP_METRICS = {'JSHeapUsedSize': 'js_heap_bytes', 'Nodes': 'dom_nodes', 'ScriptDuration': 'script_s',
+               'LayoutDuration': 'layout_s', 'TaskDuration': 'task_s'}
+
+# Budget keys and the metric each one limits, with the unit conversion.
+# Time budgets grow with the timeout factor of the throttling profile the route ran under.
+TIME_BUDGETS = ('duration_ms', 'lcp_ms')
+BUDGET_METRICS = {
+    'duration_ms': ('duration_ms', 1),
+    'lcp_ms': ('lcp_ms', 1),
+    'requests': ('requests', 1),
+    'transfer_kb': ('transfer_bytes', 1 / 1024),
+    'js_heap_mb': ('js_heap_bytes', 1 / (1024 * 1024)),
+}
+
+
+class BudgetWarning(UserWarning):
+    pass
+
+
+def install_metrics(context):
+    context.add_init_script(OBSERVER_JS)
+
+
+def _cdp_metrics(page):
+    session = getattr(page, '_cdp_session', None)
+    try:
+        if session is None:
+            session = page.context.new_cdp_session(page)
+            session.send('Performance.enable')
+            page._cdp_session = session
+        values = {metric['name']: metric['value'] for metric in session.send('Performance.getMetrics')['metrics']}
+    except PlaywrightError:
+        # Not Chromium, or the page was replaced
+        page._cdp_session = None
+        return {}
+    return {name: values[cdp_name] for cdp_name, name in CDP_METRICS.items() if cdp_name in values}
+
+
+def collect(page):
+    metrics = page.evaluate(METRICS_JS, ROUTE_MARK)
+    metrics.update(_cdp_metrics(page))
+    return metrics
+
+
+def record_metrics(record, path=METRICS_FILE):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+
+
+@functools.lru_cache(maxsize=None)
+def load_budgets(path=BUDGETS_FILE):
+    if not os.path.exists(path):
+        return {'mode': 'warn', 'default': {}, 'routes': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def budget_violations(record, budgets):
+    limits = dict(budgets.get('default', {}), **budgets.get('routes', {}).get(record['route'], {}))
+    factor = THROTTLE_PROFILES[record.get('throttle', 'none')]['timeout_factor']
+    violations = []
+    for key, limit in limits.items():
+        if key in TIME_BUDGETS:
+            limit *= factor
+        metric, scale = BUDGET_METRICS[key]
+        value = record.get(metric)
+        if value is not None and value * scale > limit:
+            violations.append(f"{key} {value * scale:.0f} > {limit}")
+    return violations
+
+
+def enforce_budget(record, budgets):
+    violations = budget_violations(record, budgets)
+    if not violations:
+        return
+    message = f"Route {record['route']} is over budget: {', '.join(violations)}"
+    if (BUDGET_MODE or budgets.get('mode', 'warn')) == 'fail':
+        raise AssertionError(message)
+    warnings.warn(message, BudgetWarning)
+
+
+@contextmanager
+def route_metrics(page, route, budgets=None):
+    # Collects the metrics of the navigation done inside the block, appends them to METRICS_FILE
+    # and checks them against the route's budget
+    page.evaluate("(mark) => { performance.clearMarks(mark); performance.mark(mark); }", ROUTE_MARK)
+    started = time.monotonic()
+    yield
+    record = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'worker': os.environ.get('PYTEST_XDIST_WORKER', 'main'),
+        'route': route['name'],
+        'throttle': throttle_of(page),
+        'url': page.url,
+        'duration_ms': round((time.monotonic() - started) * 1000, 1),
+    }
+    record.update(collect(page))
+    record_metrics(record)
+    enforce_budget(record, budgets if budgets is not None else load_budgets())